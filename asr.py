@@ -1,23 +1,123 @@
 # asr.py
 from __future__ import annotations
 import time
+import functools
+import logging
 import threading
 import asyncio
-import queue as sync_queue
+import collections
 from typing import Callable, Optional
 
 from google.cloud import speech_v1 as speech
 from stt_base import STTStreamBase, STTStatus
 
+logger = logging.getLogger(__name__)
+
 # 说明：输入必须是 16kHz、LINEAR16、单声道 PCM（与扩展发送的数据一致）
 ASR_SAMPLE_RATE = 16000
 ASR_ENCODING = speech.RecognitionConfig.AudioEncoding.LINEAR16
+# 单个gRPC请求最多合并的音频时长（毫秒）；只合并队列中已积压的数据，不会为凑批而等待
+ASR_MAX_BATCH_MS = 400
+# 音频队列容量（块数）；扩展端每块约200ms，32块约6秒
+ASR_AUDIO_QUEUE_MAXSIZE = 32
+# 复用的请求对象个数：gRPC在取下一个请求前已同步序列化上一个，小环即可安全复用
+ASR_REQUEST_POOL_SIZE = 8
+# push()调试日志的间隔（字节）
+ASR_LOG_EVERY_BYTES = 50000
+# 识别响应路径上健康检查的最小间隔（秒）
+ASR_HEALTH_CHECK_INTERVAL = 1.0
+
+# 进程内共享的SpeechClient：gRPC通道线程安全，多个流复用可省去重复的TLS握手和鉴权
+_speech_client: Optional[speech.SpeechClient] = None
+_speech_client_lock = threading.Lock()
+
+
+def get_speech_client() -> speech.SpeechClient:
+    """获取（必要时创建）共享的SpeechClient"""
+    global _speech_client
+    if _speech_client is None:
+        with _speech_client_lock:
+            if _speech_client is None:
+                _speech_client = speech.SpeechClient()
+    return _speech_client
+
+
+def warm_up_speech_client(timeout: float = 5.0) -> bool:
+    """预热共享SpeechClient：提前加载凭据并建立gRPC通道（TLS/HTTP2），
+    让第一个流不必在首句音频上承担建连延迟"""
+    try:
+        import grpc
+        client = get_speech_client()
+        grpc.channel_ready_future(client.transport.grpc_channel).result(timeout=timeout)
+        logger.info("[GoogleSTTStream] 🔥 Speech client warmed up")
+        return True
+    except Exception as e:
+        logger.warning("[GoogleSTTStream] ⚠️ Speech client warm-up failed: %s", e)
+        return False
+
+
+# 中文相关的语言代码
+_CHINESE_LANGS = frozenset({'zh-CN', 'cmn-Hans-CN', 'cmn-Hans-HK', 'cmn-Hans-TW',
+                            'cmn-Hant-TW', 'yue-Hant-HK'})
+
+
+def _is_chinese(language: str) -> bool:
+    """是否为中文相关语言（需使用command_and_search模型）"""
+    return language in _CHINESE_LANGS or language.startswith('zh') or 'cmn' in language
+
+
+@functools.lru_cache(maxsize=8)
+def _build_streaming_config(language: str, alt_langs: tuple, sample_rate: int, use_enhanced: bool = False):
+    """创建Google STT配置（单语或可选多语）；按参数缓存，proto对象只读共享"""
+    # 根据语言选择合适的模型和配置
+    if _is_chinese(language):
+        # 中文相关语言使用 command_and_search 模型，且必须设置 use_enhanced=False
+        config_kwargs = dict(
+            encoding=ASR_ENCODING,
+            sample_rate_hertz=sample_rate,
+            language_code=language,
+            enable_automatic_punctuation=True,
+            model="command_and_search",
+            use_enhanced=False,  # 中文必须为 False
+            max_alternatives=1,
+            audio_channel_count=1,
+        )
+    else:
+        # 其他语言使用 latest_long 模型；不请求逐词时间戳/置信度（下游只读transcript和confidence）
+        config_kwargs = dict(
+            encoding=ASR_ENCODING,
+            sample_rate_hertz=sample_rate,
+            language_code=language,
+            enable_automatic_punctuation=True,
+            model="latest_long",
+            use_enhanced=use_enhanced,
+            max_alternatives=1,
+            audio_channel_count=1,
+        )
+
+    # 仅当明确提供时才设置 alternative_language_codes
+    if alt_langs:
+        config_kwargs["alternative_language_codes"] = list(alt_langs)
+
+    config = speech.RecognitionConfig(**config_kwargs)
+    
+    return speech.StreamingRecognitionConfig(
+        config=config,
+        interim_results=True,
+        single_utterance=False,
+        # 增加语音上下文相关参数
+        # voice_activity_timeout=speech.StreamingRecognitionConfig.VoiceActivityTimeout(
+        #     speech_start_timeout=60,  # 等待语音开始的时间
+        #     speech_end_timeout=60     # 检测语音结束的时间
+        # )
+    )
+
 
 class GoogleSTTStream(STTStreamBase):
     """
     改进的Google STT流实现：
     - 使用队列架构避免阻塞
-    - 异步结果处理
+    - 识别线程内直接分发结果回调
     - 智能健康检查
     - 优雅的错误处理和资源清理
     - 符合STTStreamBase抽象接口
@@ -29,24 +129,33 @@ class GoogleSTTStream(STTStreamBase):
         language: str = "en-US",
         alt_langs: Optional[list[str]] = None,
         sample_rate: int = ASR_SAMPLE_RATE,
-        debug: bool = False
+        debug: bool = False,
+        max_batch_ms: int = ASR_MAX_BATCH_MS,
+        use_enhanced: bool = False  # 增强模型（费用更高），中文模型始终关闭
     ) -> None:
         # 初始化基类
         super().__init__(on_partial, on_final, language, sample_rate, debug)
         
         # Google STT特定配置
-        self._client = speech.SpeechClient()
+        self._client = get_speech_client()
         self._alt_langs = alt_langs or []
+        self._use_enhanced = use_enhanced
+        # LINEAR16 单声道：每毫秒 sample_rate * 2 / 1000 字节
+        self._max_batch_bytes = self.sample_rate * 2 * max_batch_ms // 1000
 
         # 状态管理
         self._closed = False
+        # 停止事件：close()置位，工作线程在每次取队列/收响应后快速检查
+        self._stop = threading.Event()
         self._bytes_sent = 0
-        self._start_ts = time.time()
+        self._log_countdown = ASR_LOG_EVERY_BYTES
+        self._start_ts = time.monotonic()
         
         # 健康检查相关
-        self._last_response_time = time.time()
-        self._last_transcript = ""
-        self._last_final_transcript = ""  # 分别跟踪final和partial
+        self._last_response_time = time.monotonic()
+        self._next_health_check_ts = 0.0
+        # 分别跟踪partial和final的上一条结果，按is_final下标存取：[partial, final]
+        self._last_transcripts = ["", ""]
         self._repeat_count = 0
         self._consecutive_empty_count = 0
         self._max_repeat_threshold = 10  # 增加容错次数
@@ -55,22 +164,24 @@ class GoogleSTTStream(STTStreamBase):
         self._min_transcript_length = 3  # 最小转录长度才算有效
         
         # 队列系统 - 参考优秀实现
-        self._audio_queue = sync_queue.Queue(maxsize=100)  # 音频数据队列
-        self._result_queue = sync_queue.Queue()  # 结果队列
+        # 有界音频队列：单生产者/单消费者，deque的append/popleft本身线程安全，
+        # maxlen满时自动丢弃最旧的数据以保持实时性；Event仅用于唤醒空闲的消费端
+        self._audio_queue = collections.deque(maxlen=ASR_AUDIO_QUEUE_MAXSIZE)
+        self._audio_event = threading.Event()
+        self._dropped_chunks = 0
         
         # 线程管理
         self._recognition_thread = None
-        self._result_thread = None
         
         # 配置Google STT
         self._streaming_config = self._create_streaming_config()
         
-        print(f"[GoogleSTTStream] 🚀 Initializing STT - Language: {self.language}, Alt: {self._alt_langs}")
+        logger.info("[GoogleSTTStream] 🚀 Initializing STT - Language: %s, Alt: %s", self.language, self._alt_langs)
         
         # 设置初始状态
         self._set_status(STTStatus.DISCONNECTED)
         
-        print(f"[GoogleSTTStream] ✅ STT stream initialized successfully")
+        logger.info("[GoogleSTTStream] ✅ STT stream initialized successfully")
 
     def connect(self) -> bool:
         """建立Google STT连接 - 实现抽象方法"""
@@ -98,96 +209,52 @@ class GoogleSTTStream(STTStreamBase):
         """重连实现 - 实现抽象方法"""
         self._increment_stat("reconnection_count")
         if self.debug:
-            print("[GoogleSTT] 尝试重连...")
+            logger.info("[GoogleSTT] 尝试重连...")
         
         self.close()
         time.sleep(2)  # 等待清理完成
         return self.connect()
 
     def _create_streaming_config(self):
-        """创建Google STT配置（单语或可选多语）"""
-        # 根据语言选择合适的模型和配置
-        # 中文相关的语言代码列表
-        chinese_languages = ['zh-CN', 'cmn-Hans-CN', 'cmn-Hans-HK', 'cmn-Hans-TW', 
-                            'cmn-Hant-TW', 'yue-Hant-HK']
-        
-        if self.language in chinese_languages or self.language.startswith('zh') or 'cmn' in self.language:
-            # 中文相关语言使用 command_and_search 模型，且必须设置 use_enhanced=False
-            config_kwargs = dict(
-                encoding=ASR_ENCODING,
-                sample_rate_hertz=self.sample_rate,
-                language_code=self.language,
-                enable_automatic_punctuation=True,
-                model="command_and_search",
-                use_enhanced=False,  # 中文必须为 False
-                max_alternatives=1,
-                audio_channel_count=1,
-            )
-        else:
-            # 其他语言使用 latest_long 模型和完整配置
-            config_kwargs = dict(
-                encoding=ASR_ENCODING,
-                sample_rate_hertz=self.sample_rate,
-                language_code=self.language,
-                enable_automatic_punctuation=True,
-                model="latest_long",
-                use_enhanced=True,
-                enable_word_time_offsets=True,
-                enable_word_confidence=True,
-                max_alternatives=1,
-                audio_channel_count=1,
-            )
-
-        # 仅当明确提供时才设置 alternative_language_codes
-        if getattr(self, "_alt_langs", None):
-            if isinstance(self._alt_langs, list) and len(self._alt_langs) > 0:
-                config_kwargs["alternative_language_codes"] = self._alt_langs
-
-        config = speech.RecognitionConfig(**config_kwargs)
-        
-        return speech.StreamingRecognitionConfig(
-            config=config,
-            interim_results=True,
-            single_utterance=False,
-            # 增加语音上下文相关参数
-            # voice_activity_timeout=speech.StreamingRecognitionConfig.VoiceActivityTimeout(
-            #     speech_start_timeout=60,  # 等待语音开始的时间
-            #     speech_end_timeout=60     # 检测语音结束的时间
-            # )
-        )
+        """创建Google STT配置（单语或可选多语），相同参数的流共享同一份配置"""
+        return _build_streaming_config(self.language, tuple(self._alt_langs), self.sample_rate, self._use_enhanced)
     
     def _start_threads(self):
-        """启动处理线程"""
-        # 启动识别线程
+        """启动识别线程（结果回调也在该线程内直接执行）"""
         self._recognition_thread = threading.Thread(target=self._recognition_worker, daemon=True)
         self._recognition_thread.start()
-        
-        # 启动结果处理线程
-        self._result_thread = threading.Thread(target=self._result_worker, daemon=True)
-        self._result_thread.start()
     
-    def push(self, audio_data: bytes) -> bool:
-        """推送音频数据 - 实现抽象方法"""
+    def push(self, audio_data: bytes | memoryview) -> bool:
+        """推送音频数据 - 实现抽象方法
+
+        也接受memoryview切片（入队时不拷贝），调用方在数据发出前不得修改底层缓冲区
+        """
         if self._closed:
-            print(f"[GoogleSTTStream] ⚠️ Stream closed, ignoring {len(audio_data)} bytes")
+            logger.debug("[GoogleSTTStream] Stream closed, ignoring %d bytes", len(audio_data))
             return False
             
         try:
-            self._audio_queue.put(audio_data, timeout=1.0)
-            self._bytes_sent += len(audio_data)
-            self._increment_stat("total_bytes_sent", len(audio_data))
+            n = len(audio_data)  # 只计算一次，下面的统计和日志复用
+            q = self._audio_queue
+            if len(q) == ASR_AUDIO_QUEUE_MAXSIZE:
+                # 队列已满：append会挤掉最旧的音频块，不阻塞调用方（WebSocket事件循环）
+                self._dropped_chunks += 1
+            q.append(audio_data)
+            self._audio_event.set()
+            self._bytes_sent += n
+            self._increment_stat("total_bytes_sent", n)
             self._update_activity()
             self._set_status(STTStatus.STREAMING)
             
-            # 减少日志频率
-            if self._bytes_sent % 50000 == 0:  # 每50KB记录一次
-                print(f"[GoogleSTTStream] 📊 Processed {self._bytes_sent} bytes, queue size: {self._audio_queue.qsize()}")
+            # 减少日志频率：倒数计数器每约50KB记录一次，热路径只做一次减法和比较
+            self._log_countdown -= n
+            if self._log_countdown <= 0:
+                self._log_countdown = ASR_LOG_EVERY_BYTES
+                logger.debug("[GoogleSTTStream] Processed %d bytes, queue size: %d",
+                             self._bytes_sent, len(q))
                 
             return True
             
-        except sync_queue.Full:
-            print(f"[GoogleSTTStream] ⚠️ Audio queue full, dropping {len(audio_data)} bytes")
-            return False
         except Exception as e:
             self._handle_error(e, "音频推送")
             return False
@@ -197,118 +264,168 @@ class GoogleSTTStream(STTStreamBase):
         if self._closed:
             return
             
-        print(f"[GoogleSTTStream] 🔚 Closing STT stream...")
+        logger.info("[GoogleSTTStream] 🔚 Closing STT stream...")
         self._closed = True
+        self._stop.set()
         self._set_status(STTStatus.CLOSED)
         
-        # 发送结束信号到队列
-        try:
-            self._audio_queue.put(None, timeout=1.0)
-        except sync_queue.Full:
-            pass
+        # 发送结束信号并唤醒等待中的生成器；队列满时append会挤掉最旧数据，不阻塞
+        self._audio_queue.append(None)
+        self._audio_event.set()
         
         # 等待线程结束
         if self._recognition_thread and self._recognition_thread.is_alive():
             self._recognition_thread.join(timeout=3.0)
             
-        if self._result_thread and self._result_thread.is_alive():
-            self._result_thread.join(timeout=3.0)
-            
         # 清理队列
         self._clear_queues()
         
-        runtime = time.time() - self._start_ts
-        print(f"[GoogleSTTStream] ✅ STT stream closed after {runtime:.1f}s, processed {self._bytes_sent} bytes")
+        runtime = time.monotonic() - self._start_ts
+        logger.info("[GoogleSTTStream] ✅ STT stream closed after %.1fs, processed %d bytes", runtime, self._bytes_sent)
     
-    def _check_stream_health(self) -> bool:
-        """检查STT流健康状态 - 改进版本"""
-        now = time.time()
+    def _check_stream_health(self, check_timeout: bool = True) -> bool:
+        """检查STT流健康状态 - 改进版本
         
-        # 检查响应超时
-        if now - self._last_response_time > self._response_timeout:
-            print(f"[GoogleSTTStream] ⚠️ Response timeout: {now - self._last_response_time:.1f}s since last response")
-            return False
+        Args:
+            check_timeout: 是否检查响应超时；刚收到响应时无需检查
+        """
+        # 检查响应超时（单调时钟，不受系统时间调整影响）
+        if check_timeout:
+            elapsed = time.monotonic() - self._last_response_time
+            if elapsed > self._response_timeout:
+                logger.warning("[GoogleSTTStream] ⚠️ Response timeout: %.1fs since last response", elapsed)
+                return False
         
         # 检查连续空结果
         if self._consecutive_empty_count >= self._max_empty_threshold:
-            print(f"[GoogleSTTStream] ⚠️ Too many empty results: {self._consecutive_empty_count} consecutive")
+            logger.warning("[GoogleSTTStream] ⚠️ Too many empty results: %d consecutive", self._consecutive_empty_count)
             return False
             
         # 更严格的重复检查 - 只对长文本重复敏感
         if (self._repeat_count >= self._max_repeat_threshold and 
-            len(self._last_transcript) >= self._min_transcript_length):
-            print(f"[GoogleSTTStream] ⚠️ Too many meaningful repeats: {self._repeat_count} consecutive identical results")
+            len(self._last_transcripts[0]) >= self._min_transcript_length):
+            logger.warning("[GoogleSTTStream] ⚠️ Too many meaningful repeats: %d consecutive identical results", self._repeat_count)
             return False
             
         return True
     
-    def _handle_transcript(self, text: str, is_final: bool) -> bool:
-        """处理transcript并检查重复 - 改进版本"""
-        self._last_response_time = time.time()
+    def _handle_transcript(self, text: str, is_final: bool, length: Optional[int] = None) -> bool:
+        """处理transcript并检查重复 - 改进版本
+        
+        调用方若已strip并计算过长度，可通过length传入，避免重复strip
+        """
+        now = time.monotonic()
+        self._last_response_time = now
+        
+        if length is None:
+            text = text.strip() if text else ""
+            length = len(text)
         
         # 处理空结果
-        if not text or len(text.strip()) == 0:
+        if length == 0:
             self._consecutive_empty_count += 1
-            print(f"[GoogleSTTStream] Empty result #{self._consecutive_empty_count}")
+            if self.debug:
+                logger.debug("[GoogleSTTStream] Empty result #%d", self._consecutive_empty_count)
             # 重置重复计数器，因为空结果不算重复
             self._repeat_count = 0
         else:
-            # 重置空结果计数器
-            self._consecutive_empty_count = 0
+            # 重置空结果计数器（多数响应本就为0，避免无谓的属性写入）
+            if self._consecutive_empty_count:
+                self._consecutive_empty_count = 0
             
-            # 分别跟踪final和partial结果的重复
-            if is_final:
-                comparison_text = self._last_final_transcript
-                self._last_final_transcript = text
-            else:
-                comparison_text = self._last_transcript
-                self._last_transcript = text
+            # 分别跟踪final和partial结果的重复（bool可直接作下标）
+            last_transcripts = self._last_transcripts
+            comparison_text = last_transcripts[is_final]
+            last_transcripts[is_final] = text
             
             # 检查重复 - 只对相同类型的结果比较
             if text == comparison_text:
-                self._repeat_count += 1
-                result_type = "Final" if is_final else "Partial"
-                print(f"[GoogleSTTStream] {result_type} repeat #{self._repeat_count}: '{text[:50]}{'...' if len(text) > 50 else ''}'")
+                repeat_count = self._repeat_count + 1
+                self._repeat_count = repeat_count
+                if self.debug:
+                    logger.debug("[GoogleSTTStream] %s repeat #%d: '%.50s%s'",
+                                 "Final" if is_final else "Partial", repeat_count, text, "..." if length > 50 else "")
                 
                 # 对于Final结果，即使重复也应该处理，直接返回True
                 if is_final:
-                    print(f"[GoogleSTTStream] ✅ Final result accepted despite repetition")
+                    if self.debug:
+                        logger.debug("[GoogleSTTStream] ✅ Final result accepted despite repetition")
                     return True
-            else:
+            elif self._repeat_count:
                 self._repeat_count = 0  # 重置重复计数器
             
-        # 检查是否需要重建流
-        if not self._check_stream_health():
-            print(f"[GoogleSTTStream] Stream health check failed, needs rebuild")
-            return False  # 表示需要重建
+        # 检查是否需要重建流（刚更新过响应时间，跳过超时检查）；
+        # 阈值都在秒级以上，最多每秒检查一次即可
+        if now >= self._next_health_check_ts:
+            self._next_health_check_ts = now + ASR_HEALTH_CHECK_INTERVAL
+            if not self._check_stream_health(check_timeout=False):
+                logger.warning("[GoogleSTTStream] Stream health check failed, needs rebuild")
+                return False  # 表示需要重建
             
         return True  # 流健康，继续处理
     
     def _recognition_worker(self):
         """识别工作线程"""
-        print(f"[GoogleSTTStream] 🎯 Recognition worker started")
+        logger.info("[GoogleSTTStream] 🎯 Recognition worker started")
         
         try:
             def audio_generator():
                 """音频数据生成器"""
-                while not self._closed:
+                # 循环内用到的类和方法先绑定为局部变量，省去每次的属性查找
+                # 请求对象环形复用，只替换audio_content，省去每次构造proto包装
+                req_pool = [speech.StreamingRecognizeRequest() for _ in range(ASR_REQUEST_POOL_SIZE)]
+                pool_idx = 0
+                pending = self._audio_queue
+                popleft = pending.popleft
+                event = self._audio_event
+                max_batch_bytes = self._max_batch_bytes
+                stopped = self._stop.is_set
+                while not stopped():
                     try:
-                        chunk = self._audio_queue.get(timeout=1.0)
-                        if chunk is None:  # 结束信号
+                        if not pending:
+                            # 队列为空时等待push唤醒；清除事件后回到循环开头复查队列，不会丢失唤醒
+                            event.wait(timeout=1.0)
+                            event.clear()
+                            continue
+                        chunk = popleft()
+                        if chunk is None or stopped():  # 结束信号
+                            break
+                        
+                        # 合并队列中已积压的音频块，减少gRPC请求和HTTP/2帧数量
+                        # 常见情况队列里只有这一块：直接复用原bytes对象，不建列表也不拼接
+                        parts = None
+                        total = len(chunk)
+                        end_of_stream = False
+                        while pending and total < max_batch_bytes:
+                            extra = popleft()
+                            if extra is None:
+                                end_of_stream = True
+                                break
+                            if parts is None:
+                                parts = [chunk]
+                            parts.append(extra)
+                            total += len(extra)
+                        
+                        req = req_pool[pool_idx]
+                        pool_idx = (pool_idx + 1) % ASR_REQUEST_POOL_SIZE
+                        if parts is not None:
+                            req.audio_content = b"".join(parts)  # join也接受memoryview
+                        else:
+                            req.audio_content = chunk if type(chunk) is bytes else bytes(chunk)
+                        yield req
+                        if end_of_stream:
                             break
-                        yield speech.StreamingRecognizeRequest(audio_content=chunk)
-                    except sync_queue.Empty:
-                        continue
                     except Exception as e:
-                        print(f"[GoogleSTTStream] ❌ Audio generator error: {e}")
+                        logger.error("[GoogleSTTStream] ❌ Audio generator error: %s", e)
                         break
             
-            print(f"[GoogleSTTStream] 🔄 Starting streaming recognition...")
+            logger.info("[GoogleSTTStream] 🔄 Starting streaming recognition...")
             requests = audio_generator()
             responses = self._client.streaming_recognize(self._streaming_config, requests)
             
+            stopped = self._stop.is_set
             for response in responses:
-                if self._closed:
+                if stopped():
                     break
                     
                 if not response.results:
@@ -318,8 +435,10 @@ class GoogleSTTStream(STTStreamBase):
                 if not result.alternatives:
                     continue
                     
+                # 只strip一次；空结果直接跳过，长度传给健康检查复用
                 transcript = result.alternatives[0].transcript.strip()
-                confidence = getattr(result.alternatives[0], 'confidence', 0.0)
+                if not transcript:
+                    continue
                 is_final = result.is_final
                 
                 # 提取语言检测信息
@@ -327,107 +446,43 @@ class GoogleSTTStream(STTStreamBase):
                 if not language_code:
                     language_code = self.language  # 使用默认语言作为后备
                 
-                if transcript:
-                    # 发送结果到结果队列
-                    result_data = {
-                        'transcript': transcript,
-                        'confidence': confidence,
-                        'is_final': is_final,
-                        'language_code': language_code,  # 添加语言代码
-                        'timestamp': time.time()
-                    }
+                # 健康检查
+                if not self._handle_transcript(transcript, is_final, len(transcript)):
+                    logger.warning("[GoogleSTTStream] ⚠️ Health check failed, stopping recognition worker")
+                    break
+                
+                # 直接在识别线程中分发结果，省去结果队列和额外线程
+                try:
+                    if is_final:
+                        self._handle_final_result(transcript, language_code)
+                    else:
+                        self._handle_partial_result(transcript, language_code)
+                except Exception as callback_error:
+                    logger.error("[GoogleSTTStream] ❌ Callback error: %s", callback_error)
                     
-                    try:
-                        self._result_queue.put(result_data, timeout=1.0)
-                    except sync_queue.Full:
-                        print(f"[GoogleSTTStream] ⚠️ Result queue full, dropping result")
-                        
         except Exception as e:
             error_type = type(e).__name__
-            print(f"[GoogleSTTStream] ❌ Recognition worker error ({error_type}): {e}")
-            
-            # 发送错误到结果队列
-            try:
-                self._result_queue.put({'error': str(e), 'error_type': error_type}, timeout=1.0)
-            except sync_queue.Full:
-                pass
+            logger.error("[GoogleSTTStream] ❌ Recognition worker error (%s): %s", error_type, e)
                 
             # 根据错误类型提供建议
             if "DEADLINE_EXCEEDED" in str(e) or "timeout" in str(e).lower():
-                print(f"[GoogleSTTStream] 💡 Timeout error - connection may need retry")
+                logger.warning("[GoogleSTTStream] 💡 Timeout error - connection may need retry")
             elif "RESOURCE_EXHAUSTED" in str(e):
-                print(f"[GoogleSTTStream] 💡 Resource exhausted - may need backoff")
+                logger.warning("[GoogleSTTStream] 💡 Resource exhausted - may need backoff")
             elif "UNAUTHENTICATED" in str(e):
-                print(f"[GoogleSTTStream] 💡 Auth error - check credentials")
+                logger.warning("[GoogleSTTStream] 💡 Auth error - check credentials")
                 
         finally:
-            print(f"[GoogleSTTStream] 🏁 Recognition worker finished")
-    
-    def _result_worker(self):
-        """结果处理工作线程"""
-        print(f"[GoogleSTTStream] 📝 Result worker started")
-        
-        try:
-            while not self._closed:
-                try:
-                    result_data = self._result_queue.get(timeout=1.0)
-                    
-                    # 处理错误
-                    if 'error' in result_data:
-                        print(f"[GoogleSTTStream] ❌ Received error: {result_data.get('error_type', 'Unknown')}: {result_data['error']}")
-                        # 错误处理可以在这里触发重建逻辑
-                        break
-                    
-                    # 处理正常结果
-                    transcript = result_data['transcript']
-                    confidence = result_data['confidence']
-                    is_final = result_data['is_final']
-                    language_code = result_data.get('language_code', self.language)
-                    
-                    # 健康检查
-                    if not self._handle_transcript(transcript, is_final):
-                        print(f"[GoogleSTTStream] ⚠️ Health check failed, stopping result worker")
-                        break
-                    
-                    # 使用基类的结果处理方法
-                    try:
-                        if is_final:
-                            self._handle_final_result(transcript, language_code)
-                        else:
-                            self._handle_partial_result(transcript, language_code)
-                    except Exception as callback_error:
-                        print(f"[GoogleSTTStream] ❌ Callback error: {callback_error}")
-                    
-                except sync_queue.Empty:
-                    continue
-                except Exception as e:
-                    print(f"[GoogleSTTStream] ❌ Result worker error: {e}")
-                    break
-                    
-        except Exception as e:
-            print(f"[GoogleSTTStream] ❌ Result worker exception: {e}")
-        finally:
-            print(f"[GoogleSTTStream] 🏁 Result worker finished")
+            logger.info("[GoogleSTTStream] 🏁 Recognition worker finished")
     
     def _clear_queues(self):
         """清理所有队列"""
         try:
             # 清空音频队列
-            while not self._audio_queue.empty():
-                try:
-                    self._audio_queue.get_nowait()
-                except sync_queue.Empty:
-                    break
-                    
-            # 清空结果队列
-            while not self._result_queue.empty():
-                try:
-                    self._result_queue.get_nowait()
-                except sync_queue.Empty:
-                    break
+            self._audio_queue.clear()
                     
         except Exception as e:
-            print(f"[GoogleSTTStream] ⚠️ Error clearing queues: {e}")
+            logger.warning("[GoogleSTTStream] ⚠️ Error clearing queues: %s", e)
 
     def is_healthy(self) -> bool:
         """检查流是否健康 - 扩展基类实现"""
@@ -443,20 +498,18 @@ class GoogleSTTStream(STTStreamBase):
         # 获取基类统计信息
         stats = super().get_stats()
         
-        # 添加Google STT特定统计
-        stats.update({
-            'engine': 'google',
-            'google_stats': {
-                'bytes_sent_total': self._bytes_sent,
-                'audio_queue_size': self._audio_queue.qsize(),
-                'result_queue_size': self._result_queue.qsize(),
-                'repeat_count': self._repeat_count,
-                'consecutive_empty_count': self._consecutive_empty_count,
-                'last_response_age': time.time() - self._last_response_time,
-                'last_transcript_length': len(self._last_transcript),
-                'last_final_transcript_length': len(self._last_final_transcript),
-                'is_closed': self._closed
-            }
-        })
+        # 添加Google STT特定统计（直接赋值，省去临时dict和update合并）
+        stats['engine'] = 'google'
+        stats['google_stats'] = {
+            'bytes_sent_total': self._bytes_sent,
+            'audio_queue_size': len(self._audio_queue),
+            'dropped_chunks': self._dropped_chunks,
+            'repeat_count': self._repeat_count,
+            'consecutive_empty_count': self._consecutive_empty_count,
+            'last_response_age': time.monotonic() - self._last_response_time,
+            'last_transcript_length': len(self._last_transcripts[0]),
+            'last_final_transcript_length': len(self._last_transcripts[1]),
+            'is_closed': self._closed
+        }
         
         return stats
@@ -26,6 +26,18 @@ class STTEngine(Enum):
     IFLYTEK = "iflytek"
 
 
+def _bool_env(name: str, default: bool) -> bool:
+    """读取布尔型环境变量（"true"不区分大小写为真）"""
+    val = os.environ.get(name)
+    return default if val is None else val.strip().lower() == "true"
+
+
+def _int_env(name: str, default: int) -> int:
+    """读取整型环境变量"""
+    val = os.environ.get(name)
+    return default if val is None else int(val)
+
+
 class Config:
     """系统配置类"""
     
@@ -39,9 +51,10 @@ class Config:
     DEEPGRAM_API_KEY: Optional[str] = os.getenv("DEEPGRAM_API_KEY")
     DEEPGRAM_MODEL: str = os.getenv("DEEPGRAM_MODEL", "nova-3")
     DEEPGRAM_LANGUAGE: str = os.getenv("DEEPGRAM_LANGUAGE", "multi")
-    DEEPGRAM_SMART_FORMAT: bool = os.getenv("DEEPGRAM_SMART_FORMAT", "true").lower() == "true"
-    DEEPGRAM_INTERIM_RESULTS: bool = os.getenv("DEEPGRAM_INTERIM_RESULTS", "true").lower() == "true"
-    DEEPGRAM_ENDPOINTING: int = int(os.getenv("DEEPGRAM_ENDPOINTING", "300"))
+    DEEPGRAM_SMART_FORMAT: bool = _bool_env("DEEPGRAM_SMART_FORMAT", True)
+    DEEPGRAM_INTERIM_RESULTS: bool = _bool_env("DEEPGRAM_INTERIM_RESULTS", True)
+    DEEPGRAM_ENDPOINTING: int = _int_env("DEEPGRAM_ENDPOINTING", 300)
+    DEEPGRAM_PARTIAL_MIN_DELTA_CHARS: int = _int_env("DEEPGRAM_PARTIAL_MIN_DELTA_CHARS", 3)
 
     # iFlytek（讯飞）配置
     # 去除环境变量中的意外空格/换行，避免鉴权签名失败
@@ -57,57 +70,71 @@ class Config:
     # 业务参数：默认中文普通话，开启中英混合（rlang=en_us）
     IFLYTEK_LANGUAGE: str = os.getenv("IFLYTEK_LANGUAGE", "zh_cn")
     IFLYTEK_ACCENT: str = os.getenv("IFLYTEK_ACCENT", "mandarin")
-    IFLYTEK_PTT: int = int(os.getenv("IFLYTEK_PTT", "1"))
+    IFLYTEK_PTT: int = _int_env("IFLYTEK_PTT", 1)
     IFLYTEK_RLANG: str = os.getenv("IFLYTEK_RLANG", "en_us")
+    # 静音跳过的峰值阈值（16bit样本幅度，如200）；0表示关闭，所有音频都发送
+    IFLYTEK_SILENCE_THRESHOLD: int = _int_env("IFLYTEK_SILENCE_THRESHOLD", 0)
     
     # 音频配置
-    AUDIO_SAMPLE_RATE: int = int(os.getenv("AUDIO_SAMPLE_RATE", "16000"))
-    AUDIO_CHUNK_SIZE: int = int(os.getenv("AUDIO_CHUNK_SIZE", "1024"))
+    AUDIO_SAMPLE_RATE: int = _int_env("AUDIO_SAMPLE_RATE", 16000)
+    AUDIO_CHUNK_SIZE: int = _int_env("AUDIO_CHUNK_SIZE", 1024)
     
     # 翻译配置
-    TRANSLATION_CACHE_SIZE: int = int(os.getenv("TRANSLATION_CACHE_SIZE", "1000"))
-    TRANSLATION_MAX_RETRIES: int = int(os.getenv("TRANSLATION_MAX_RETRIES", "2"))
+    TRANSLATION_CACHE_SIZE: int = _int_env("TRANSLATION_CACHE_SIZE", 1000)
+    TRANSLATION_MAX_RETRIES: int = _int_env("TRANSLATION_MAX_RETRIES", 2)
     
     # WebSocket配置
     WEBSOCKET_HOST: str = os.getenv("WEBSOCKET_HOST", "0.0.0.0")
-    WEBSOCKET_PORT: int = int(os.getenv("WEBSOCKET_PORT", "8080"))
+    WEBSOCKET_PORT: int = _int_env("WEBSOCKET_PORT", 8080)
     
     # 调试配置
-    DEBUG_MODE: bool = os.getenv("DEBUG_MODE", "false").lower() == "true"
+    DEBUG_MODE: bool = _bool_env("DEBUG_MODE", False)
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
     
+    # GCP环境检测结果缓存（元数据探测最多阻塞1秒，只做一次）
+    _GCP_CACHE: Optional[bool] = None
+    
+    # 已解析的STT引擎缓存：(STT_ENGINE原始值, 引擎)，原始值变化时重新解析
+    _ENGINE_CACHE: Optional[tuple] = None
+    
     @classmethod
     def get_stt_engine(cls) -> STTEngine:
         """获取当前配置的STT引擎"""
-        try:
-            return STTEngine(cls.STT_ENGINE.lower())
-        except ValueError:
+        cached = cls._ENGINE_CACHE
+        if cached is not None and cached[0] == cls.STT_ENGINE:
+            return cached[1]
+        
+        engine = STTEngine._value2member_map_.get(cls.STT_ENGINE.lower())
+        if engine is None:
             print(f"[Config] ⚠️ 未知的STT引擎: {cls.STT_ENGINE}, 使用默认: Google")
-            return STTEngine.GOOGLE
+            engine = STTEngine.GOOGLE
+        cls._ENGINE_CACHE = (cls.STT_ENGINE, engine)
+        return engine
     
     @classmethod
     def validate_config(cls) -> Dict[str, Any]:
         """验证配置并返回验证结果"""
+        engine = cls.get_stt_engine()
         results = {
             "valid": True,
             "warnings": [],
             "errors": [],
-            "engine": cls.get_stt_engine()
+            "engine": engine
         }
         
         # 验证STT引擎配置
-        if cls.get_stt_engine() == STTEngine.GOOGLE:
+        if engine == STTEngine.GOOGLE:
             # 在Google Cloud Run环境中，不需要显式设置GOOGLE_APPLICATION_CREDENTIALS
             # Google Client Libraries会自动使用默认服务账号凭据
             # 只有在本地开发且未设置凭据时才提示
             if not cls.GOOGLE_APPLICATION_CREDENTIALS and not cls._is_running_on_gcp():
                 results["warnings"].append("GOOGLE_APPLICATION_CREDENTIALS未设置，在本地开发时可能需要设置")
         
-        elif cls.get_stt_engine() == STTEngine.DEEPGRAM:
+        elif engine == STTEngine.DEEPGRAM:
             if not cls.DEEPGRAM_API_KEY:
                 results["errors"].append("DEEPGRAM_API_KEY必须设置才能使用Deepgram STT")
                 results["valid"] = False
-        elif cls.get_stt_engine() == STTEngine.IFLYTEK:
+        elif engine == STTEngine.IFLYTEK:
             missing = []
             if not cls.IFLYTEK_APPID:
                 missing.append("IFLYTEK_APPID")
@@ -128,6 +155,12 @@ class Config:
         
         return results
     
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """清除引擎和GCP检测缓存（修改环境变量或类属性后调用）"""
+        cls._ENGINE_CACHE = None
+        cls._GCP_CACHE = None
+    
     @classmethod
     def get_stt_config(cls) -> Dict[str, Any]:
         """获取当前STT引擎的配置"""
@@ -163,20 +196,22 @@ class Config:
                 "language": cls.DEEPGRAM_LANGUAGE,
                 "smart_format": cls.DEEPGRAM_SMART_FORMAT,
                 "interim_results": cls.DEEPGRAM_INTERIM_RESULTS,
-                "endpointing": cls.DEEPGRAM_ENDPOINTING
+                "endpointing": cls.DEEPGRAM_ENDPOINTING,
+                "partial_min_delta_chars": cls.DEEPGRAM_PARTIAL_MIN_DELTA_CHARS
             }
         elif engine == STTEngine.IFLYTEK:
             return {
                 **base_config,
-                # 再次strip防御
-                "appid": cls._env_strip("IFLYTEK_APPID") or cls.IFLYTEK_APPID,
-                "api_key": cls._env_strip("IFLYTEK_API_KEY") or cls.IFLYTEK_API_KEY,
-                "api_secret": cls._env_strip("IFLYTEK_API_SECRET") or cls.IFLYTEK_API_SECRET,
+                # 类属性在导入时已strip，无需再读环境变量
+                "appid": cls.IFLYTEK_APPID,
+                "api_key": cls.IFLYTEK_API_KEY,
+                "api_secret": cls.IFLYTEK_API_SECRET,
                 "hosturl": cls.IFLYTEK_HOSTURL,
                 "language": cls.IFLYTEK_LANGUAGE,
                 "accent": cls.IFLYTEK_ACCENT,
                 "ptt": cls.IFLYTEK_PTT,
                 "rlang": cls.IFLYTEK_RLANG,
+                "silence_threshold": cls.IFLYTEK_SILENCE_THRESHOLD,
             }
         
         return base_config
@@ -184,8 +219,9 @@ class Config:
     @classmethod
     def print_config_summary(cls):
         """打印配置摘要"""
+        engine = cls.get_stt_engine()
         print("\n[Config] 🔧 系统配置摘要:")
-        print(f"  STT引擎: {cls.get_stt_engine().value}")
+        print(f"  STT引擎: {engine.value}")
         print(f"  音频采样率: {cls.AUDIO_SAMPLE_RATE}Hz")
         print(f"  WebSocket: {cls.WEBSOCKET_HOST}:{cls.WEBSOCKET_PORT}")
         print(f"  调试模式: {'开启' if cls.DEBUG_MODE else '关闭'}")
@@ -200,7 +236,7 @@ class Config:
             print("  ✅ 配置验证通过")
         
         # 显示引擎特定配置
-        if cls.get_stt_engine() == STTEngine.DEEPGRAM:
+        if engine == STTEngine.DEEPGRAM:
             print(f"  Deepgram模型: {cls.DEEPGRAM_MODEL}")
             print(f"  Deepgram语言: {cls.DEEPGRAM_LANGUAGE}")
         
@@ -214,6 +250,14 @@ class Config:
         Returns:
             bool: 如果在GCP上运行返回True，否则返回False
         """
+        if cls._GCP_CACHE is not None:
+            return cls._GCP_CACHE
+        cls._GCP_CACHE = cls._detect_gcp()
+        return cls._GCP_CACHE
+    
+    @classmethod
+    def _detect_gcp(cls) -> bool:
+        """实际执行GCP环境检测（环境变量优先，必要时探测元数据服务器）"""
         # 检查常见的GCP环境变量
         gcp_indicators = [
             "GOOGLE_CLOUD_PROJECT",  # 项目ID
@@ -226,6 +270,10 @@ class Config:
             if os.getenv(indicator):
                 return True
         
+        # CI/本地可设置 CONFIG_PROBE_GCP_METADATA=0 完全跳过网络探测
+        if os.getenv("CONFIG_PROBE_GCP_METADATA", "1") != "1":
+            return False
+        
         # 检查GCP元数据服务器
         try:
             import urllib.request
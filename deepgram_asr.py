@@ -6,13 +6,17 @@ Deepgram语音识别包装类
 """
 
 import asyncio
+import concurrent.futures
 import json
+import os
+import re
 import threading
 import time
-import queue
 from typing import Optional, Dict, Any
 import logging
 
+logger = logging.getLogger(__name__)
+
 try:
     from deepgram import (
         DeepgramClient, 
@@ -40,6 +44,60 @@ except ImportError:
 from stt_base import STTStreamBase, STTStatus
 
 
+# 语言检测用的预编译正则：CJK统一表意文字 / 字母数字（与str.isalnum一致，不含下划线）
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+_ALNUM_RE = re.compile(r'[^\W_]')
+# partial节流：新增后缀含空白或标点（非字母数字）时视为词/句边界，不节流
+_BOUNDARY_RE = re.compile(r'[\W_]')
+
+# 空闲多久（秒）发送一次KeepAlive；Deepgram约10秒无数据会断开
+DEEPGRAM_KEEPALIVE_INTERVAL = 5.0
+_KEEPALIVE_MESSAGE = json.dumps({"type": "KeepAlive"})
+
+# 按API密钥共享的DeepgramClient：每个流/每次重连只新建WebSocket连接，不重复初始化客户端
+_CLIENT_POOL: Dict[str, "DeepgramClient"] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _get_client(api_key: str) -> "DeepgramClient":
+    """获取（必要时创建）指定API密钥对应的共享客户端"""
+    with _POOL_LOCK:
+        client = _CLIENT_POOL.get(api_key)
+        if client is None:
+            client = DeepgramClient(api_key)
+            _CLIENT_POOL[api_key] = client
+    return client
+
+
+# 进程内共享的asyncio事件循环：所有Deepgram流复用同一个后台线程，
+# 避免每次（重）连接都新建线程和事件循环
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """获取（必要时启动）共享事件循环"""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None or _LOOP.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="deepgram-loop", daemon=True).start()
+            _LOOP = loop
+    return _LOOP
+
+
+class _TranscriptState:
+    """每条转录结果都会读写的热路径状态，使用__slots__避免实例字典查找"""
+    __slots__ = ('repeat_count', 'last_text', 'utterance_lang', 'last_detection', 'last_emitted')
+    
+    def __init__(self, language: str):
+        self.repeat_count = 0
+        self.last_text = ""
+        self.utterance_lang: Optional[str] = None  # 当前句（partial阶段）的语言检测结果
+        self.last_detection = ("", language)  # (文本, 检测结果) 单条缓存
+        self.last_emitted = ""  # 本句最近一次回调出去的partial，用于增量节流
+
+
 class DeepgramSTTStream(STTStreamBase):
     """
     Deepgram语音识别流包装类
@@ -63,7 +121,9 @@ class DeepgramSTTStream(STTStreamBase):
         interim_results: bool = True,
         endpointing: int = 300,
         sample_rate: int = 16000,
-        debug: bool = False
+        debug: bool = False,
+        max_batch_ms: int = 400,
+        partial_min_delta_chars: int = 3
     ):
         """
         初始化Deepgram STT流
@@ -79,6 +139,8 @@ class DeepgramSTTStream(STTStreamBase):
             endpointing: 停顿检测时间(ms)
             sample_rate: 音频采样率
             debug: 调试模式
+            max_batch_ms: 单次WebSocket发送最多合并的音频时长(ms)，只合并已积压的数据
+            partial_min_delta_chars: partial相对上次回调的新增字符少于该值时不回调（0表示不节流）
         """
         super().__init__(on_partial, on_final, language, sample_rate, debug)
         
@@ -90,15 +152,22 @@ class DeepgramSTTStream(STTStreamBase):
         self.smart_format = smart_format
         self.interim_results = interim_results
         self.endpointing = endpointing
+        self.partial_min_delta_chars = partial_min_delta_chars
+        # LINEAR16 单声道：每毫秒 sample_rate * 2 / 1000 字节
+        self._max_batch_bytes = sample_rate * 2 * max_batch_ms // 1000
         
         # Deepgram客户端和连接
         self.client: Optional[DeepgramClient] = None
         self.connection = None
         
-        # 异步运行时控制
+        # 异步运行时控制（loop为共享事件循环，_session_task为本流的收发协程）
         self.loop = None
-        self.loop_thread = None
-        self._audio_queue = queue.Queue()
+        self._session_task = None
+        # 音频队列只在事件循环线程中读写，push()通过call_soon_threadsafe投递
+        self._audio_queue: asyncio.Queue = asyncio.Queue(maxsize=256)
+        self._dropped_chunks = 0
+        self._dropped_bytes = 0
+        self._last_send_time = 0.0  # 事件循环时钟，最近一次发送数据的时间
         self._should_stop = threading.Event()
         
         # 重连控制
@@ -107,16 +176,26 @@ class DeepgramSTTStream(STTStreamBase):
         self.current_reconnect_attempts = 0
         
         # 健康检查
-        self._repeat_count = 0
-        self._last_text = ""
+        self._ts = _TranscriptState(self.language)
         self._max_repeats = 3
         
         # 错误处理
         self._connection_errors = 0
         self._max_connection_errors = 3
         
-        if debug:
-            print(f"[DeepgramSTT] 初始化: model={model}, language={language}")
+        # 连接选项只依赖不可变的实例参数，构建一次供每次（重）连接复用
+        self._live_options = LiveOptions(
+            model=self.model,
+            language=self.language,
+            smart_format=self.smart_format,
+            interim_results=self.interim_results,
+            endpointing=self.endpointing,
+            sample_rate=self.sample_rate,
+            encoding="linear16",  # PCM 16位
+            channels=1  # 单声道
+        )
+        
+        logger.debug("[DeepgramSTT] 初始化: model=%s, language=%s", model, language)
     
     def connect(self) -> bool:
         """建立Deepgram连接"""
@@ -124,36 +203,25 @@ class DeepgramSTTStream(STTStreamBase):
             self._set_status(STTStatus.CONNECTING)
             
             # 停止之前的连接
-            if self.loop_thread and self.loop_thread.is_alive():
-                self._should_stop.set()
-                self.loop_thread.join(timeout=3)
+            self._stop_session()
             
             # 重置状态
             self._should_stop.clear()
             
-            # 启动异步事件循环线程
-            self.loop_thread = threading.Thread(target=self._run_async_loop, daemon=True)
-            self.loop_thread.start()
-            
-            # 等待连接建立
-            max_wait = 10  # 最多等待10秒
-            start_time = time.time()
-            
-            while time.time() - start_time < max_wait:
-                if self.get_status() == STTStatus.CONNECTED:
-                    if self.debug:
-                        print("[DeepgramSTT] ✅ 连接成功")
-                    return True
-                elif self.get_status() == STTStatus.ERROR:
-                    if self.debug:
-                        print("[DeepgramSTT] ❌ 连接失败")
-                    return False
-                time.sleep(0.1)
+            # 在共享事件循环上建立连接，直接等待结果而不是轮询状态
+            self.loop = _get_loop()
+            future = asyncio.run_coroutine_threadsafe(self._async_connect(), self.loop)
+            try:
+                connected = future.result(timeout=10)  # 最多等待10秒
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                # 连接超时
+                self._set_status(STTStatus.ERROR)
+                self._handle_error(Exception("Deepgram连接超时"), "连接")
+                return False
             
-            # 连接超时
-            self._set_status(STTStatus.ERROR)
-            self._handle_error(Exception("Deepgram连接超时"), "连接")
-            return False
+            logger.debug("[DeepgramSTT] %s", "✅ 连接成功" if connected else "❌ 连接失败")
+            return connected
                     
         except Exception as e:
             self._set_status(STTStatus.ERROR)
@@ -161,23 +229,30 @@ class DeepgramSTTStream(STTStreamBase):
             self._connection_errors += 1
             return False
     
-    def _run_async_loop(self):
-        """在独立线程中运行异步事件循环"""
-        try:
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
-            self.loop.run_until_complete(self._async_connect_and_listen())
-        except Exception as e:
-            self._handle_error(e, "异步循环")
-        finally:
-            if self.loop:
-                self.loop.close()
+    def _stop_session(self, timeout: float = 3) -> None:
+        """停止当前连接的收发协程并关闭WebSocket（在调用线程中等待完成）"""
+        self._should_stop.set()
+        if not self.loop or self.loop.is_closed():
+            return
+        
+        if self.connection:
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self.connection.finish(), self.loop
+                ).result(timeout=timeout)
+            except Exception:
+                pass
+        
+        task = self._session_task
+        if task and not task.done():
+            self.loop.call_soon_threadsafe(task.cancel)
+        self._session_task = None
     
-    async def _async_connect_and_listen(self):
-        """异步连接和监听Deepgram"""
+    async def _async_connect(self) -> bool:
+        """异步连接Deepgram，成功后在共享循环上启动收发协程"""
         try:
-            # 创建Deepgram客户端
-            self.client = DeepgramClient(self.api_key)
+            # 获取（共享的）Deepgram客户端
+            self.client = _get_client(self.api_key)
             
             # 创建WebSocket连接 - 使用asyncwebsocket
             self.connection = self.client.listen.asyncwebsocket.v("1")
@@ -189,20 +264,8 @@ class DeepgramSTTStream(STTStreamBase):
             self.connection.on(LiveTranscriptionEvents.Error, self._on_error)
             self.connection.on(LiveTranscriptionEvents.Metadata, self._on_metadata)
             
-            # 配置选项
-            options = LiveOptions(
-                model=self.model,
-                language=self.language,
-                smart_format=self.smart_format,
-                interim_results=self.interim_results,
-                endpointing=self.endpointing,
-                sample_rate=self.sample_rate,
-                encoding="linear16",  # PCM 16位
-                channels=1  # 单声道
-            )
-            
-            # 启动连接
-            if await self.connection.start(options):
+            # 启动连接（选项在初始化时已构建，重连直接复用）
+            if await self.connection.start(self._live_options):
                 self._set_status(STTStatus.CONNECTED)
                 self._increment_stat("connection_count")
                 self._connection_errors = 0
@@ -213,32 +276,56 @@ class DeepgramSTTStream(STTStreamBase):
                         self._stats["start_time"] = time.time()
                 
                 # 启动音频发送协程
-                await asyncio.gather(
-                    self._audio_sender(),
-                    self._keep_alive()
-                )
+                self._session_task = asyncio.ensure_future(self._run_session())
+                return True
             else:
                 self._set_status(STTStatus.ERROR)
                 self._handle_error(Exception("Deepgram连接启动失败"), "连接")
+                return False
                 
         except Exception as e:
             self._set_status(STTStatus.ERROR)
             self._handle_error(e, "异步连接")
+            return False
+    
+    async def _run_session(self):
+        """运行本连接的音频发送和保活协程"""
+        self._last_send_time = asyncio.get_running_loop().time()
+        try:
+            await asyncio.gather(
+                self._audio_sender(),
+                self._keep_alive()
+            )
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self._handle_error(e, "异步循环")
     
     async def _audio_sender(self):
         """音频发送协程"""
+        audio_queue = self._audio_queue
+        max_batch_bytes = self._max_batch_bytes
+        loop_time = asyncio.get_running_loop().time
         while not self._should_stop.is_set():
             try:
-                # 从队列获取音频数据，非阻塞
-                audio_data = None
-                try:
-                    audio_data = self._audio_queue.get_nowait()
-                except queue.Empty:
-                    await asyncio.sleep(0.01)  # 10ms
-                    continue
+                # 等待音频数据到达（事件驱动，无轮询）
+                audio_data = await audio_queue.get()
+                
+                # 合并队列中已积压的音频块，减少WebSocket帧和系统调用；不为凑批而等待
+                if not audio_queue.empty() and len(audio_data) < max_batch_bytes:
+                    parts = [audio_data]
+                    total = len(audio_data)
+                    while total < max_batch_bytes and not audio_queue.empty():
+                        extra = audio_queue.get_nowait()
+                        parts.append(extra)
+                        total += len(extra)
+                    audio_data = b"".join(parts)  # join也接受memoryview
+                elif type(audio_data) is not bytes:
+                    audio_data = bytes(audio_data)  # SDK的send()需要bytes
                 
                 if audio_data and self.connection:
                     await self.connection.send(audio_data)
+                    self._last_send_time = loop_time()
                     self._increment_stat("total_bytes_sent", len(audio_data))
                     self._update_activity()
                     
@@ -247,69 +334,80 @@ class DeepgramSTTStream(STTStreamBase):
                 break
     
     async def _keep_alive(self):
-        """保持连接活跃"""
+        """保持连接活跃：仅在一段时间没有发送音频时才发送KeepAlive
+
+        Deepgram在约10秒收不到数据后会关闭连接；持续有音频时本协程只是按剩余时间休眠。
+        close()会取消会话任务，休眠立即结束。
+        """
+        loop = asyncio.get_running_loop()
+        interval = DEEPGRAM_KEEPALIVE_INTERVAL
         while not self._should_stop.is_set():
-            await asyncio.sleep(30)  # 每30秒检查一次
-            if self.get_status() == STTStatus.CONNECTED:
-                # 可以发送keep-alive消息或检查连接状态
-                pass
+            idle = loop.time() - self._last_send_time
+            if idle < interval:
+                await asyncio.sleep(interval - idle)
+                continue
+            
+            connection = self.connection
+            if connection:
+                try:
+                    await connection.send(_KEEPALIVE_MESSAGE)
+                except Exception as e:
+                    self._handle_error(e, "KeepAlive")
+            self._last_send_time = loop.time()
     
-    def push(self, audio_data: bytes) -> bool:
-        """推送音频数据到Deepgram"""
-        if not audio_data or len(audio_data) == 0:
+    def push(self, audio_data: bytes | memoryview) -> bool:
+        """推送音频数据到Deepgram
+
+        也接受memoryview切片（入队时不拷贝），调用方在数据发出前不得修改底层缓冲区
+        """
+        if not audio_data:
             return True
             
         try:
             if self.get_status() == STTStatus.ERROR:
-                if self.debug:
-                    print("[DeepgramSTT] ⚠️ 连接不可用，尝试重连")
+                logger.info("[DeepgramSTT] ⚠️ 连接不可用，尝试重连")
                 if not self._reconnect():
                     return False
             
-            # 将音频数据放入队列，由async协程处理
-            try:
-                self._audio_queue.put_nowait(audio_data)
-                self._set_status(STTStatus.STREAMING)
-                return True
-            except queue.Full:
-                if self.debug:
-                    print("[DeepgramSTT] ⚠️ 音频队列已满，丢弃数据")
-                return False
+            # 将音频数据投递到事件循环线程的队列，由async协程处理
+            loop = self.loop
+            if loop is not None and not loop.is_closed():
+                loop.call_soon_threadsafe(self._enqueue_audio, audio_data)
+            else:
+                # 尚未连接：发送协程还未启动，可直接入队
+                self._enqueue_audio(audio_data)
+            self._set_status(STTStatus.STREAMING)
+            return True
                 
         except Exception as e:
             self._handle_error(e, "音频推送")
             return False
     
+    def _enqueue_audio(self, audio_data: bytes | memoryview) -> None:
+        """在事件循环线程中入队音频；队列满时丢弃最旧的数据以保持实时性"""
+        try:
+            self._audio_queue.put_nowait(audio_data)
+        except asyncio.QueueFull:
+            try:
+                dropped = self._audio_queue.get_nowait()
+                self._dropped_bytes += len(dropped)
+            except asyncio.QueueEmpty:
+                pass
+            self._audio_queue.put_nowait(audio_data)
+            self._dropped_chunks += 1
+            logger.debug("[DeepgramSTT] ⚠️ 音频队列已满，丢弃最旧数据")
+    
     def close(self) -> None:
         """关闭Deepgram连接"""
         try:
-            # 停止异步循环
-            self._should_stop.set()
-            
-            # 关闭连接
-            if self.connection and self.loop:
-                # 安全关闭异步连接
-                def close_connection():
-                    if self.connection:
-                        asyncio.run_coroutine_threadsafe(
-                            self.connection.finish(), self.loop
-                        )
-                
-                try:
-                    close_connection()
-                except:
-                    pass
-            
-            # 等待线程结束
-            if self.loop_thread and self.loop_thread.is_alive():
-                self.loop_thread.join(timeout=3)
+            # 停止收发协程并关闭连接（共享事件循环继续为其他流服务）
+            self._stop_session()
                     
             self.connection = None
             self.client = None
             self._set_status(STTStatus.CLOSED)
             
-            if self.debug:
-                print("[DeepgramSTT] 连接已关闭")
+            logger.debug("[DeepgramSTT] 连接已关闭")
                 
         except Exception as e:
             self._handle_error(e, "关闭连接")
@@ -317,22 +415,16 @@ class DeepgramSTTStream(STTStreamBase):
     def _reconnect(self) -> bool:
         """重新连接到Deepgram"""
         if self.current_reconnect_attempts >= self.max_reconnect_attempts:
-            if self.debug:
-                print(f"[DeepgramSTT] 重连次数达到上限 ({self.max_reconnect_attempts})")
+            logger.warning("[DeepgramSTT] 重连次数达到上限 (%d)", self.max_reconnect_attempts)
             return False
         
         self.current_reconnect_attempts += 1
         self._increment_stat("reconnection_count")
         
-        if self.debug:
-            print(f"[DeepgramSTT] 尝试重连 ({self.current_reconnect_attempts}/{self.max_reconnect_attempts})")
+        logger.info("[DeepgramSTT] 尝试重连 (%d/%d)", self.current_reconnect_attempts, self.max_reconnect_attempts)
         
         # 关闭现有连接
-        try:
-            if self.connection:
-                self.connection.finish()
-        except:
-            pass
+        self._stop_session()
         
         # 等待重连延迟
         time.sleep(self.reconnect_delay)
@@ -344,50 +436,71 @@ class DeepgramSTTStream(STTStreamBase):
     
     async def _on_open(self, connection, open_response, **kwargs):
         """连接打开事件"""
-        if self.debug:
-            print("[DeepgramSTT] WebSocket连接已打开")
+        logger.debug("[DeepgramSTT] WebSocket连接已打开")
         self._set_status(STTStatus.CONNECTED)
     
     async def _on_close(self, connection, close_response, **kwargs):
         """连接关闭事件"""
-        if self.debug:
-            print("[DeepgramSTT] WebSocket连接已关闭")
+        logger.debug("[DeepgramSTT] WebSocket连接已关闭")
         
         if self.get_status() != STTStatus.CLOSED:
             self._set_status(STTStatus.DISCONNECTED)
     
     async def _on_error(self, connection, error, **kwargs):
         """错误事件"""
-        self._handle_error(Exception(f"Deepgram WebSocket错误: {error}"), "WebSocket")
+        # 传入原始对象，由logging在需要输出时再格式化
+        logger.warning("[DeepgramSTT] WebSocket错误: %s", error)
+        if not isinstance(error, Exception):
+            error = Exception(str(error))
+        self._handle_error(error, "Deepgram WebSocket")
     
     async def _on_metadata(self, connection, metadata, **kwargs):
         """元数据事件"""
-        if self.debug:
-            print(f"[DeepgramSTT] 收到元数据: {metadata}")
+        logger.debug("[DeepgramSTT] 收到元数据: %s", metadata)
     
     async def _on_message(self, connection, result, **kwargs):
         """转录结果事件"""
         try:
-            # 解析结果
-            if hasattr(result, 'channel') and result.channel:
-                alternatives = result.channel.alternatives
-                if alternatives and len(alternatives) > 0:
-                    transcript = alternatives[0].transcript
-                    is_final = getattr(result, 'is_final', False)
-                    speech_final = getattr(result, 'speech_final', False)
-                    
-                    # 检测语言（Deepgram可能在metadata中提供）
-                    detected_language = self._detect_language_from_text(transcript)
-                    
-                    if transcript and transcript.strip():
-                        # 健康检查：避免重复文本
-                        if not self._health_check_transcript(transcript, is_final):
+            # 解析结果：直接读取属性，结构不符时一次性返回（替代hasattr + getattr链）
+            try:
+                transcript = result.channel.alternatives[0].transcript
+            except (AttributeError, IndexError, TypeError):
+                return
+            if not transcript or not transcript.strip():
+                return
+            
+            is_final = getattr(result, 'is_final', False)
+            
+            # 健康检查：避免重复文本（先于语言检测，被跳过的结果不做检测）
+            if not self._health_check_transcript(transcript, is_final):
+                return
+            
+            ts = self._ts
+            if is_final or getattr(result, 'speech_final', False):
+                # 最终结果按完整文本检测语言，并结束本句的语言缓存
+                detected_language = self._detect_language_from_text(transcript)
+                ts.utterance_lang = None
+                ts.last_emitted = ""
+                self._handle_final_result(transcript, detected_language)
+            else:
+                # 纯前缀增长的partial：新增后缀太短且不含边界字符时不回调，减少下游翻译和推送；
+                # 修订了已回调文本（"by"→"buy"）或新增了空白/标点的partial总是回调
+                min_delta = self.partial_min_delta_chars
+                if min_delta > 0:
+                    last_emitted = ts.last_emitted
+                    # 常见情况是纯前缀增长：startswith在C层比较，命中时无需逐字求公共前缀
+                    if transcript.startswith(last_emitted):
+                        suffix = transcript[len(last_emitted):]
+                        if len(suffix) < min_delta and not _BOUNDARY_RE.search(suffix):
                             return
-                        
-                        if is_final or speech_final:
-                            self._handle_final_result(transcript, detected_language)
-                        else:
-                            self._handle_partial_result(transcript, detected_language)
+                ts.last_emitted = transcript
+                
+                # 同一句的partial语言基本不变：只在本句第一条partial检测一次
+                detected_language = ts.utterance_lang
+                if detected_language is None:
+                    detected_language = self._detect_language_from_text(transcript)
+                    ts.utterance_lang = detected_language
+                self._handle_partial_result(transcript, detected_language)
                     
         except Exception as e:
             self._handle_error(e, "处理转录结果")
@@ -405,19 +518,24 @@ class DeepgramSTTStream(STTStreamBase):
         if not text:
             return self.language
         
-        # 简单的中文检测
-        chinese_chars = sum(1 for char in text if '\u4e00' <= char <= '\u9fff')
-        total_chars = len([c for c in text if c.isalnum()])
-        
-        if total_chars == 0:
-            return self.language
+        # interim结果常常重复上一条，命中时直接复用
+        last_text, last_result = self._ts.last_detection
+        if text == last_text:
+            return last_result
         
-        chinese_ratio = chinese_chars / total_chars
+        # 简单的中文检测（正则在C层扫描，替代逐字符的Python循环）
+        chinese_chars = len(_CJK_RE.findall(text))
+        total_chars = len(_ALNUM_RE.findall(text))
         
-        if chinese_ratio > 0.3:  # 30%以上中文字符
-            return "zh-CN"
+        if total_chars == 0:
+            result = self.language
+        elif chinese_chars / total_chars > 0.3:  # 30%以上中文字符
+            result = "zh-CN"
         else:
-            return "en-US"
+            result = "en-US"
+        
+        self._ts.last_detection = (text, result)
+        return result
     
     def _health_check_transcript(self, text: str, is_final: bool) -> bool:
         """
@@ -430,22 +548,23 @@ class DeepgramSTTStream(STTStreamBase):
         Returns:
             bool: 是否应该处理此文本
         """
+        ts = self._ts
+        
         # 对于最终结果，总是处理
         if is_final:
-            self._repeat_count = 0
-            self._last_text = text
+            ts.repeat_count = 0
+            ts.last_text = text
             return True
         
         # 检查重复文本
-        if text == self._last_text:
-            self._repeat_count += 1
-            if self._repeat_count > self._max_repeats:
-                if self.debug:
-                    print(f"[DeepgramSTT] ⚠️ 检测到重复文本，跳过: '{text[:30]}...'")
+        if text == ts.last_text:
+            ts.repeat_count += 1
+            if ts.repeat_count > self._max_repeats:
+                logger.debug("[DeepgramSTT] ⚠️ 检测到重复文本，跳过: '%.30s...'", text)
                 return False
         else:
-            self._repeat_count = 0
-            self._last_text = text
+            ts.repeat_count = 0
+            ts.last_text = text
         
         return True
     
@@ -461,14 +580,12 @@ class DeepgramSTTStream(STTStreamBase):
         
         # 检查连接错误
         if self._connection_errors >= self._max_connection_errors:
-            if self.debug:
-                print(f"[DeepgramSTT] 不健康：连接错误过多 ({self._connection_errors})")
+            logger.debug("[DeepgramSTT] 不健康：连接错误过多 (%d)", self._connection_errors)
             return False
         
         # 检查重连次数
         if self.current_reconnect_attempts >= self.max_reconnect_attempts:
-            if self.debug:
-                print(f"[DeepgramSTT] 不健康：重连次数达到上限")
+            logger.debug("[DeepgramSTT] 不健康：重连次数达到上限")
             return False
         
         return True
@@ -494,8 +611,10 @@ class DeepgramSTTStream(STTStreamBase):
         stats.update({
             "engine": "deepgram",
             "deepgram_config": self.get_deepgram_config(),
-            "repeat_count": self._repeat_count,
-            "last_text_preview": self._last_text[:50] if self._last_text else None
+            "repeat_count": self._ts.repeat_count,
+            "dropped_chunks": self._dropped_chunks,
+            "dropped_bytes": self._dropped_bytes,
+            "last_text_preview": self._ts.last_text[:50] or None
         })
         return stats
 
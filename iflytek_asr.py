@@ -7,15 +7,18 @@ iFlytek (科大讯飞) 实时语音识别
 """
 
 import base64
-import datetime
+import collections
 import hashlib
 import hmac
 import json
+import logging
+import re
 import threading
 import time
-import queue
+import warnings
+from email.utils import formatdate
 from typing import Optional, Dict, Any
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlparse
 
 try:
     import websocket  # websocket-client
@@ -24,8 +27,47 @@ except ImportError:
     print("[iFlytekASR] ⚠️ websocket-client 未安装，请运行: pip install websocket-client")
     IFLYTEK_WS_AVAILABLE = False
 
+# audioop在Python 3.13中已移除：可用时用其C实现计算峰值，否则退回memoryview逐样本比较
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import audioop
+except ImportError:
+    audioop = None
+
+# orjson为可选加速：安装后用于解析服务端结果（每条识别结果一次），否则使用标准库json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from stt_base import STTStreamBase, STTStatus
 
+logger = logging.getLogger(__name__)
+
+# 官方建议的最小帧为1280字节（40ms）；合并为更大的帧可减少WebSocket消息与TLS记录数
+IFLYTEK_MIN_FRAME_MS = 40
+IFLYTEK_DEFAULT_FRAME_MS = 160
+# 待发送音频的上限（按时长/字节计），超出时丢弃最旧的帧，避免连接卡住时内存无限增长
+IFLYTEK_MAX_QUEUED_MS = 10000
+# 跳过静音期间每隔该时长仍发送一次静音推送：服务端约10秒收不到音频会断开会话
+IFLYTEK_SILENCE_KEEPALIVE_MS = 5000
+
+# 中文（CJK统一表意文字）检测，正则在C层扫描
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+
+
+def _pcm16_peak(data: memoryview) -> int:
+    """16bit小端PCM的峰值幅度"""
+    data = data[:len(data) & ~1]
+    if audioop is not None:
+        return audioop.max(data, 2)
+    samples = data.cast('h')
+    if not samples:
+        return 0
+    return max(max(samples), -min(samples))
+
 
 class IflytekSTTStream(STTStreamBase):
     """
@@ -53,6 +95,8 @@ class IflytekSTTStream(STTStreamBase):
         dwa: str = "wpgs",
         sample_rate: int = 16000,
         debug: bool = False,
+        frame_ms: int = IFLYTEK_DEFAULT_FRAME_MS,
+        silence_threshold: int = 0,
     ):
         super().__init__(on_partial, on_final, language, sample_rate, debug)
 
@@ -71,13 +115,61 @@ class IflytekSTTStream(STTStreamBase):
         self.business_vinfo = vinfo
         self.business_dwa = dwa
 
+        # 鉴权中不随时间变化的部分：每次(重)连接只需重新计算date与签名
+        parsed_url = urlparse(hosturl)
+        self._auth_host = parsed_url.hostname
+        self._auth_path = parsed_url.path
+        self._api_secret_bytes = api_secret.encode('utf-8')
+        self._auth_prefix = f'api_key="{api_key}", algorithm="hmac-sha256", headers="host date request-line", signature="'
+
+        # 每个WebSocket帧携带的音频（40ms的整数倍，16bit单声道），发送节流按帧时长计算
+        frame_ms = max(IFLYTEK_MIN_FRAME_MS, frame_ms - frame_ms % IFLYTEK_MIN_FRAME_MS)
+        self._bytes_per_sec = sample_rate * 2
+        self._frame_size = self._bytes_per_sec * frame_ms // 1000
+
+        # 首帧(status=0)的common/business在整个会话中不变，只构建一次
+        self._audio_format = f"audio/L16;rate={sample_rate}"
+        self._first_frame_head = {
+            "common": {"app_id": appid},
+            "business": {
+                "domain": "iat",
+                "language": language,
+                "accent": accent,
+                "ptt": ptt,
+                "rlang": rlang,
+                "vad_eos": vad_eos,
+                "vinfo": vinfo,
+                "dwa": dwa,
+            },
+        }
+
+        # 中间帧(status=1)只有audio字段变化：预先序列化JSON前后缀，发送时直接拼接base64
+        self._mid_frame_prefix = (
+            '{"data":{"status":1,"format":"audio/L16;rate=%d","encoding":"raw","audio":"' % sample_rate
+        ).encode('ascii')
+        self._mid_frame_suffix = b'"}}'
+
         # WS/线程
         self._ws: Optional[websocket.WebSocketApp] = None
         self._ws_thread: Optional[threading.Thread] = None
         self._sender_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
         self._connected_event = threading.Event()
-        self._audio_queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=100)
+        # 待发送帧：push线程append、发送线程popleft（deque两端操作线程安全，无需Queue的锁和条件变量）
+        # 元素为已base64编码的帧音频，发送线程只需套上模板并发送
+        self._audio_frames: "collections.deque[Optional[bytes]]" = collections.deque()
+        self._audio_event = threading.Event()
+        self._max_queued_frames = max(1, IFLYTEK_MAX_QUEUED_MS // frame_ms)
+        self._dropped_frames = 0
+
+        # 静音跳过（silence_threshold为0时关闭）：峰值低于阈值的推送不再编码发送。
+        # 持续静音超过vad_eos后才开始跳过，保证服务端VAD仍能检测到句尾并返回最终结果
+        self._silence_threshold = silence_threshold
+        self._silence_hangover_bytes = self._bytes_per_sec * (vad_eos + 500) // 1000
+        self._silent_bytes = 0
+        self._skipped_silence_bytes = 0
+        self._silence_keepalive_bytes = self._bytes_per_sec * IFLYTEK_SILENCE_KEEPALIVE_MS // 1000
+        self._skipped_since_send = 0
 
         # 发送帧状态控制
         self._first_frame_sent = False
@@ -87,39 +179,31 @@ class IflytekSTTStream(STTStreamBase):
         self._agg_text = ""
         self._last_partial = ""
         # 动态纠错(PGS)累积段
-        self._pgs_segments = []  # [{"sn": int, "text": str}]
+        self._pgs_segments: Dict[int, str] = {}  # sn -> 文本
 
         # 统计
         self._bytes_sent_total = 0
 
-        if self.debug:
-            print(f"[iFlytekSTT] 初始化: lang={language}, accent={accent}, rlang={rlang}")
+        logger.debug("[iFlytekSTT] 初始化: lang=%s, accent=%s, rlang=%s", language, accent, rlang)
 
     # ============ 连接与鉴权 ============
     def _rfc1123_date(self) -> str:
-        # 使用与官方demo一致的RFC1123格式，避免细微格式差异
-        from wsgiref.handlers import format_date_time
-        from time import mktime
-        now = datetime.datetime.utcnow()
-        stamp = mktime(now.timetuple())
-        return format_date_time(stamp)
+        # 与官方demo一致的RFC1123格式（如 "Thu, 15 Oct 2026 08:00:00 GMT"）
+        return formatdate(usegmt=True)
 
     def _build_auth_url(self) -> str:
         """按官方文档生成鉴权URL"""
-        from urllib.parse import urlparse
-
-        url = urlparse(self.hosturl)
-        host = url.hostname
-        path = url.path
+        host = self._auth_host
+        path = self._auth_path
         date = self._rfc1123_date()
 
         signature_origin = f"host: {host}\n" \
                            f"date: {date}\n" \
                            f"GET {path} HTTP/1.1"
-        signature_sha = hmac.new(self.api_secret.encode('utf-8'), signature_origin.encode('utf-8'), digestmod=hashlib.sha256).digest()
+        signature_sha = hmac.new(self._api_secret_bytes, signature_origin.encode('utf-8'), digestmod=hashlib.sha256).digest()
         signature = base64.b64encode(signature_sha).decode('utf-8')
 
-        authorization_origin = f'api_key="{self.api_key}", algorithm="hmac-sha256", headers="host date request-line", signature="{signature}"'
+        authorization_origin = f'{self._auth_prefix}{signature}"'
         authorization = base64.b64encode(authorization_origin.encode('utf-8')).decode('utf-8')
 
         params = {
@@ -128,8 +212,7 @@ class IflytekSTTStream(STTStreamBase):
             "host": host,
         }
         full_url = f"{self.hosturl}?{urlencode(params)}"
-        if self.debug:
-            print(f"[iFlytekSTT] Auth URL parts -> host:{host}, path:{path}, date:{date}")
+        logger.debug("[iFlytekSTT] Auth URL parts -> host:%s, path:%s, date:%s", host, path, date)
         return full_url
 
     def connect(self) -> bool:
@@ -166,16 +249,14 @@ class IflytekSTTStream(STTStreamBase):
                     with self._stats_lock:
                         if not self._stats["start_time"]:
                             self._stats["start_time"] = time.time()
-                    if self.debug:
-                        print("[iFlytekSTT] ✅ 连接成功")
+                    logger.debug("[iFlytekSTT] ✅ 连接成功")
                     return True
                 if self.get_status() == STTStatus.ERROR:
                     break
                 time.sleep(0.05)
 
             self._set_status(STTStatus.ERROR)
-            if self.debug:
-                print("[iFlytekSTT] ❌ 连接超时")
+            logger.warning("[iFlytekSTT] ❌ 连接超时")
             return False
 
         except Exception as e:
@@ -199,67 +280,107 @@ class IflytekSTTStream(STTStreamBase):
         try:
             silence = b"\x00" * 1280  # 约40ms的16k/16bit静音
             data_b64 = base64.b64encode(silence).decode('utf-8')
-            first_frame = {
-                "common": {"app_id": self.appid},
-                "business": {
-                    "domain": "iat",
-                    "language": self.business_language,
-                    "accent": self.business_accent,
-                    "ptt": self.business_ptt,
-                    "rlang": self.business_rlang,
-                    "vad_eos": self.business_vad_eos,
-                    "vinfo": self.business_vinfo,
-                    "dwa": self.business_dwa,
-                },
-                "data": {
-                    "status": 0,
-                    "format": f"audio/L16;rate={self.sample_rate}",
-                    "encoding": "raw",
-                    "audio": data_b64,
-                },
-            }
             if self._ws and self._ws.sock and self._ws.sock.connected:
-                self._ws.send(json.dumps(first_frame))
+                self._ws.send(self._build_first_frame(data_b64))
                 self._first_frame_sent = True
-                if self.debug:
-                    print("[iFlytekSTT] 首帧(status=0) 静音包已发送")
+                logger.debug("[iFlytekSTT] 首帧(status=0) 静音包已发送")
         except Exception as e:
             # 首帧失败不致命，发送线程会在有音频时再尝试首帧
-            if self.debug:
-                print(f"[iFlytekSTT] 首帧静音发送失败: {e}")
+            logger.debug("[iFlytekSTT] 首帧静音发送失败: %s", e)
 
     def _on_close(self, ws, *args):
-        if self.debug:
-            print("[iFlytekSTT] WS 关闭")
+        logger.debug("[iFlytekSTT] WS 关闭")
         if not self._closed:
             self._set_status(STTStatus.ERROR)
 
     def _on_error(self, ws, error):
-        if self.debug:
-            print(f"[iFlytekSTT] 错误: {error}")
+        logger.warning("[iFlytekSTT] 错误: %s", error)
         self._handle_error(Exception(str(error)), "WS错误")
         self._set_status(STTStatus.ERROR)
 
     # ============ 发送与推送 ============
-    def push(self, audio_data: bytes) -> bool:
+    def _build_first_frame(self, audio_b64: str) -> str:
+        """首帧(status=0)：复用预构建的common/business，只填入音频"""
+        return json.dumps({
+            **self._first_frame_head,
+            "data": {
+                "status": 0,
+                "format": self._audio_format,
+                "encoding": "raw",
+                "audio": audio_b64,
+            },
+        })
+
+    def push(self, audio_data: bytes | memoryview) -> bool:
         if not audio_data or self._closed:
             return False
+        # 会话已被服务端关闭（_on_close/_on_error）：返回失败以便调用方重建
+        if self.get_status() == STTStatus.ERROR:
+            return False
         try:
-            self._audio_queue.put_nowait(audio_data)
+            # 入队前按帧大小切分（memoryview切片不拷贝）并完成base64编码，
+            # 发送线程只负责发送和节流，编码不会推迟下一帧的发送
+            mv = memoryview(audio_data)
+            n = len(mv)
+            if self._silence_threshold:
+                if _pcm16_peak(mv) < self._silence_threshold:
+                    self._silent_bytes += n
+                    if self._silent_bytes > self._silence_hangover_bytes:
+                        if self._skipped_since_send + n <= self._silence_keepalive_bytes:
+                            self._skipped_since_send += n
+                            self._skipped_silence_bytes += n
+                            self._update_activity()
+                            return True
+                        # 已连续跳过约IFLYTEK_SILENCE_KEEPALIVE_MS：照常发送本次推送以保持会话
+                        self._skipped_since_send = 0
+                else:
+                    self._silent_bytes = 0
+                    self._skipped_since_send = 0
+            frame_size = self._frame_size
+            frames = self._audio_frames
+            max_frames = self._max_queued_frames
+            overflow = len(frames) + -(-n // frame_size) - max_frames
+            if overflow > 0:
+                # 发送端落后时丢弃最旧的帧而不是新帧，使端到端延迟有上界，
+                # 一次发送卡顿不会变成永久的延迟
+                dropped = 0
+                if n > max_frames * frame_size:
+                    # 单次推送本身超过队列上限：只保留最新的部分
+                    dropped = -(-n // frame_size) - max_frames
+                    mv = mv[n - max_frames * frame_size:]
+                    n = len(mv)
+                    overflow = len(frames)
+                for _ in range(overflow):
+                    try:
+                        frames.popleft()
+                    except IndexError:
+                        # 发送线程已取走剩余帧
+                        break
+                    dropped += 1
+                self._dropped_frames += dropped
+                logger.debug("[iFlytekSTT] ⚠️ 音频队列已满，丢弃最旧的%d帧", dropped)
+            b64encode = base64.b64encode
+            for offset in range(0, n, frame_size):
+                frames.append(b64encode(mv[offset: offset + frame_size]))
+            self._audio_event.set()
             self._set_status(STTStatus.STREAMING)
-            self._increment_stat("total_bytes_sent", len(audio_data))
-            self._bytes_sent_total += len(audio_data)
+            self._increment_stat("total_bytes_sent", n)
+            self._bytes_sent_total += n
             self._update_activity()
             return True
-        except queue.Full:
-            if self.debug:
-                print("[iFlytekSTT] ⚠️ 音频队列已满，丢弃数据")
-            return False
         except Exception as e:
             self._handle_error(e, "音频推送")
             return False
 
     def _sender_worker(self):
+        mid_prefix = self._mid_frame_prefix
+        mid_suffix = self._mid_frame_suffix
+        text_opcode = websocket.ABNF.OPCODE_TEXT
+        frames = self._audio_frames
+        audio_event = self._audio_event
+        bytes_per_sec = self._bytes_per_sec
+        # 基于单调时钟的发送节奏：按累计音频时长推进截止时间，扣除编码/发送耗时，避免漂移
+        next_deadline = time.monotonic()
         try:
             while not self._stop_event.is_set():
                 # 等待WS连接建立，避免在握手前发送任何数据帧
@@ -267,68 +388,47 @@ class IflytekSTTStream(STTStreamBase):
                     time.sleep(0.01)
                     continue
 
+                if not frames:
+                    # 队列为空时等待push唤醒；清除事件后回到循环开头复查队列，不会丢失唤醒
+                    audio_event.wait(timeout=0.1)
+                    audio_event.clear()
+                    continue
                 try:
-                    chunk = self._audio_queue.get(timeout=0.1)
-                except queue.Empty:
+                    data_b64 = frames.popleft()
+                except IndexError:
+                    # 队列满时push()会从队头丢弃旧帧，可能与这里的检查竞争
                     continue
 
-                if chunk is None:
+                if data_b64 is None:
                     break
 
-                # 按官方建议拆分为1280字节（约40ms @16kHz 16bit mono）的小帧
-                frame_size = 1280
-                offset = 0
-                while offset < len(chunk) and not self._stop_event.is_set():
-                    piece = chunk[offset: offset + frame_size]
-                    offset += frame_size
-
-                    data_b64 = base64.b64encode(piece).decode('utf-8')
-
-                    if not self._first_frame_sent:
-                        # 首帧：包含common和business，status=0
-                        frame = {
-                            "common": {"app_id": self.appid},
-                            "business": {
-                                "domain": "iat",
-                                "language": self.business_language,
-                                "accent": self.business_accent,
-                                "ptt": self.business_ptt,
-                                "rlang": self.business_rlang,
-                                "vad_eos": self.business_vad_eos,
-                                "vinfo": self.business_vinfo,
-                                "dwa": self.business_dwa,
-                            },
-                            "data": {
-                                "status": 0,
-                                "format": f"audio/L16;rate={self.sample_rate}",
-                                "encoding": "raw",
-                                "audio": data_b64,
-                            },
-                        }
-                    else:
-                        # 中间帧：仅data，status=1
-                        frame = {
-                            "data": {
-                                "status": 1,
-                                "format": f"audio/L16;rate={self.sample_rate}",
-                                "encoding": "raw",
-                                "audio": data_b64,
-                            }
-                        }
+                # push()已按frame_size切好帧并编码（默认160ms，即4个官方建议的40ms小帧合并发送）
 
-                    try:
-                        if self._ws and self._ws.sock and self._ws.sock.connected:
-                            if self.debug and not self._first_frame_sent:
-                                print("[iFlytekSTT] 即将发送首帧(status=0) 音频")
-                            self._ws.send(json.dumps(frame))
-                            self._first_frame_sent = True
-                    except Exception as e:
-                        self._handle_error(e, "发送音频帧")
-                        self._set_status(STTStatus.ERROR)
-                        break
+                if self._first_frame_sent:
+                    # 中间帧：仅data，status=1（预序列化模板 + base64）
+                    frame = mid_prefix + data_b64 + mid_suffix
+                else:
+                    # 首帧：包含common和business，status=0
+                    frame = self._build_first_frame(data_b64.decode('ascii'))
+
+                try:
+                    if self._ws and self._ws.sock and self._ws.sock.connected:
+                        if not self._first_frame_sent:
+                            logger.debug("[iFlytekSTT] 即将发送首帧(status=0) 音频")
+                        self._ws.send(frame, opcode=text_opcode)
+                        self._first_frame_sent = True
+                except Exception as e:
+                    self._handle_error(e, "发送音频帧")
+                    self._set_status(STTStatus.ERROR)
+                    continue
 
-                    # 发送节流：每个小帧约40ms
-                    time.sleep(0.04)
+                # 发送节流：只休眠到本帧时长对应的截止时间；已落后（发送耗时过长或刚从空闲恢复）则重置，不补偿
+                next_deadline += len(data_b64) * 3 // 4 / bytes_per_sec  # base64长度换算回音频字节
+                delay = next_deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_deadline = time.monotonic()
 
         except Exception as e:
             self._handle_error(e, "发送线程")
@@ -336,7 +436,7 @@ class IflytekSTTStream(STTStreamBase):
     # ============ 接收与结果处理 ============
     def _on_message(self, ws, message):
         try:
-            data = json.loads(message)
+            data = _json_loads(message)
             code = data.get("code", -1)
             if code != 0:
                 # 打印更多上下文，便于定位鉴权/参数问题
@@ -363,7 +463,7 @@ class IflytekSTTStream(STTStreamBase):
             language_code = self._detect_lang(text)
 
             # 聚合：使用PGS(rpl/apd)与sn/range来稳定拼接，避免重复
-            self._agg_text = self._aggregate_pgs(result)
+            self._agg_text = self._aggregate_pgs(result, text)
 
             # 发送 partial
             current_partial = self._agg_text or text
@@ -379,83 +479,51 @@ class IflytekSTTStream(STTStreamBase):
                 # 为下一段重置
                 self._agg_text = ""
                 self._last_partial = ""
-                self._pgs_segments = []
+                self._pgs_segments = {}
 
         except Exception as e:
             self._handle_error(e, "处理消息")
 
     def _parse_result_text(self, result: Dict[str, Any]) -> str:
         try:
-            ws_list = result.get("ws", [])
-            parts = []
-            for w in ws_list:
-                cws = w.get("cw", [])
-                if not cws:
-                    continue
-                # 取第一候选
-                parts.append(cws[0].get("w", ""))
-            return "".join(parts)
+            # 每个词取第一候选；cw为空的词跳过
+            return "".join(cws[0].get("w", "") for w in result.get("ws", ()) if (cws := w.get("cw")))
         except Exception:
             return ""
 
-    def _update_aggregate_text(self, current: str, result: Dict[str, Any]) -> str:
-        # 处理 pgs（分段策略）：apd=追加, rpl=替换
-        try:
-            pgs = result.get("pgs")
-            text = self._parse_result_text(result)
-            if not text:
-                return current
-            if pgs == "apd" or pgs is None:
-                return current + text
-            if pgs == "rpl":
-                rg = result.get("rg", [1, 1])
-                # 简化处理：当替换时，以当前内容与新文本拼接（严格算法需保留分词列表，这里以稳健性为先）
-                # 退化到覆盖策略：直接返回当前+新文本去重结果
-                candidate = current + text
-                # 粗略去重：如果 text 已是 suffix 则不重复拼接
-                if candidate.endswith(text + text):
-                    return current + text
-                return candidate
-            return current
-        except Exception:
-            return current
-
-    def _aggregate_pgs(self, result: Dict[str, Any]) -> str:
+    def _aggregate_pgs(self, result: Dict[str, Any], text: str) -> str:
         """基于PGS的稳健聚合，消除重复
-        - 使用 sn 作为序号
-        - pgs=apd 追加；pgs=rpl 根据 rg 范围移除后再追加
+        - 使用 sn 作为序号，段落按 sn 存放
+        - pgs=apd 追加；pgs=rpl 先删除 rg=[start, end] 范围内的段，再写入本段
         """
+        segments = self._pgs_segments
         try:
-            text = self._parse_result_text(result)
-            if not text:
-                # 如果解析不到文本，返回现有聚合
-                return "".join(seg.get('text', '') for seg in sorted(self._pgs_segments, key=lambda s: s.get('sn', 0)))
-
             sn = result.get('sn')
-            pgs = result.get('pgs')
-            rg = result.get('rg', [])
-
-            # 当rpl时，删除rg范围内的段
-            if pgs == 'rpl' and isinstance(rg, list) and len(rg) == 2:
-                start, end = rg
-                self._pgs_segments = [seg for seg in self._pgs_segments if not (isinstance(seg.get('sn'), int) and start <= seg['sn'] <= end)]
-
-            # 删除同sn旧段，插入新段
-            self._pgs_segments = [seg for seg in self._pgs_segments if seg.get('sn') != sn]
-            self._pgs_segments.append({'sn': sn if isinstance(sn, int) else (self._pgs_segments[-1]['sn'] + 1 if self._pgs_segments else 0), 'text': text})
-
-            # 排序并拼接
-            self._pgs_segments.sort(key=lambda s: s.get('sn', 0))
-            agg = "".join(seg['text'] for seg in self._pgs_segments if seg.get('text'))
-            return agg
+            if not isinstance(sn, int):
+                sn = max(segments) + 1 if segments else 0
+
+            # 当rpl时，删除rg范围内的段（本结果替换这些段）
+            if result.get('pgs') == 'rpl':
+                rg = result.get('rg')
+                if isinstance(rg, list) and len(rg) == 2:
+                    start, end = rg
+                    for key in [k for k in segments if start <= k <= end]:
+                        del segments[key]
+
+            # 同sn的旧段直接被覆盖
+            segments[sn] = text
+
+            # sn通常递增写入，字典已有序；仅在乱序到达时排序
+            keys = list(segments)
+            if keys != sorted(keys):
+                self._pgs_segments = segments = dict(sorted(segments.items()))
+            return "".join(segments.values())
         except Exception:
             # 兜底：回退到简单拼接（不建议，但防止异常时中断）
-            return (self._agg_text or "") + self._parse_result_text(result)
+            return (self._agg_text or "") + text
 
     def _detect_lang(self, text: str) -> str:
-        if any('\u4e00' <= ch <= '\u9fff' for ch in text):
-            return "zh-CN"
-        return "en-US"
+        return "zh-CN" if _CJK_RE.search(text) else "en-US"
 
     # ============ 关闭与重连 ============
     def close(self) -> None:
@@ -469,7 +537,7 @@ class IflytekSTTStream(STTStreamBase):
             end_frame = {
                 "data": {
                     "status": 2,
-                    "format": f"audio/L16;rate={self.sample_rate}",
+                    "format": self._audio_format,
                     "encoding": "raw",
                     "audio": "",
                 },
@@ -485,8 +553,10 @@ class IflytekSTTStream(STTStreamBase):
         try:
             # 停止发送线程
             if self._sender_thread and self._sender_thread.is_alive():
-                self._audio_queue.put_nowait(None)
+                self._audio_frames.append(None)
+                self._audio_event.set()
                 self._sender_thread.join(timeout=2)
+            self._audio_frames.clear()
         except Exception:
             pass
 
@@ -518,6 +588,9 @@ class IflytekSTTStream(STTStreamBase):
         stats.update({
             "engine": "iflytek",
             "bytes_sent_total": self._bytes_sent_total,
+            "audio_queue_size": len(self._audio_frames),
+            "dropped_frames": self._dropped_frames,
+            "skipped_silence_bytes": self._skipped_silence_bytes,
         })
         return stats
 
@@ -1,15 +1,70 @@
 # main.py
+# 部署时以 `uvicorn main:app --ws-per-message-deflate false` 启动（见Dockerfile）：
+# /stream传输的是不可压缩的PCM音频和短字幕，permessage-deflate只会浪费CPU和每连接内存
 from __future__ import annotations
-import json
 import time
 import re
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, WebSocket
 from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import asyncio
 from stt_factory import create_stt_stream, STTFactory
-from config import Config
-from translate import translate_en_to_zh_async, translate_zh_to_en_async, get_translation_stats
+from config import Config, STTEngine
+from translate import translate_en_to_zh_async, translate_zh_to_en_async, get_translation_stats, close_http_session
+
+# 模块日志（各STT引擎热路径上的调试输出走logging，由LOG_LEVEL控制是否输出）
+logging.basicConfig(level=Config.LOG_LEVEL, format="%(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+# STT的push/connect/close是同步调用（gRPC/WebSocket），网络卡顿或重连时可能阻塞；
+# 统一放到该线程池执行，避免阻塞事件循环上的其他连接。
+# 线程池由所有连接共享：每个连接同一时刻最多占用两个worker（音频推送与健康检查），
+# 一次重建（关闭旧流+connect）可能占用worker 10秒以上，因此32个worker约可支撑16个连接同时重建而不排队；
+# 超出时推送会在池中排队，音频由audio_queue的丢弃最旧策略限制延迟
+_stt_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="stt")
+
+# /stream固定使用的STT引擎（与STT_ENGINE配置无关），启动预热按此引擎进行
+_STREAM_STT_ENGINE = STTEngine.GOOGLE
+
+# orjson为可选加速：安装后用于转义字幕文本（C实现，直接输出UTF-8），否则使用标准库json的C转义函数。
+# 客户端按文本帧解析，因此解码为str后仍走send_text
+try:
+    import orjson
+
+    def _json_str(text: str) -> str:
+        return orjson.dumps(text).decode('utf-8')
+except ImportError:
+    from json.encoder import encode_basestring as _json_str
+
+
+def _subtitle_payload(en: str, zh: str, is_final: bool, display: str) -> str:
+    """按固定字段拼接字幕JSON：只转义两个文本字段，无需构建dict和通用编码"""
+    return ('{"en":' + _json_str(en) + ',"zh":' + _json_str(zh)
+            + (',"isFinal":true,"display":"' if is_final else ',"isFinal":false,"display":"')
+            + display + '"}')
+
+def _coalesce_backlog(backlog: list) -> list:
+    """
+    合并积压的出站消息：被后续字幕取代的partial已过时（客户端只显示最新字幕），
+    只保留final、PONG和最新的partial，其余消息保持原顺序
+
+    backlog为按入队顺序排列的(消息, 是否为partial字幕)，返回待逐条发送的消息
+    """
+    kept = []
+    superseded = False
+    for data, is_partial in reversed(backlog):
+        if is_partial:
+            if superseded:
+                continue
+            superseded = True
+        elif data != "PONG":
+            superseded = True
+        kept.append(data)
+    kept.reverse()
+    return kept
 
 # 语言处理工具函数
 def has_sentence_ending_punctuation(text: str) -> bool:
@@ -62,7 +117,7 @@ def detect_text_language(text: str, stt_language_code: str = None) -> str:
     
     # 如果STT明确检测为中文但没有中文字符，可能是误判
     if stt_language_code and stt_language_code.startswith('zh') and not has_chinese:
-        print(f"[Language] ⚠️ STT detected Chinese but no Chinese chars found in: '{text[:30]}...'")
+        logger.debug("[Language] ⚠️ STT detected Chinese but no Chinese chars found in: '%.30s...'", text)
         # 降级到基于字符的检测
         return 'en-US'  # 默认英文
     
@@ -83,15 +138,40 @@ app.add_middleware(
     allow_methods=["*"],
 )
 
+def _log_warm_up_result(future: asyncio.Future) -> None:
+    """预热在后台完成，异常需在回调中取出并记录，否则只会在GC时被报告"""
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        logger.warning("[Backend] ⚠️ STT warm-up failed: %s", exc)
+
+@app.on_event("startup")
+async def warm_up_stt():
+    """后台预热/stream所用Google引擎的共享SpeechClient，不阻塞服务启动"""
+    try:
+        if _STREAM_STT_ENGINE != STTEngine.GOOGLE:
+            return
+        from asr import warm_up_speech_client
+        future = asyncio.get_running_loop().run_in_executor(None, warm_up_speech_client)
+        future.add_done_callback(_log_warm_up_result)
+    except Exception as e:
+        logger.warning("[Backend] ⚠️ STT warm-up skipped: %s", e)
+
+@app.on_event("shutdown")
+async def close_translate_session():
+    """关闭翻译共享的aiohttp会话"""
+    await close_http_session()
+
 @app.get("/", response_class=PlainTextResponse)
 def root():
     return "OK"
 
 @app.websocket("/stream")
 async def stream(ws: WebSocket):
-    print("[Backend] WebSocket connection attempt")
+    logger.info("[Backend] WebSocket connection attempt")
     await ws.accept()
-    print("[Backend] ✅ WebSocket connection accepted")
+    logger.info("[Backend] ✅ WebSocket connection accepted")
     
     # 从查询参数读取模式：en2zh 或 zh2en（默认 en2zh）
     try:
@@ -103,16 +183,31 @@ async def stream(ws: WebSocket):
     translate_mode = (mode_param or 'en2zh').lower()
     if translate_mode not in ('en2zh', 'zh2en'):
         translate_mode = 'en2zh'
-    print(f"[Backend] 🎛️ Translate mode: {translate_mode}")
+    logger.info("[Backend] 🎛️ Translate mode: %s", translate_mode)
     if stt_lang_param:
-        print(f"[Backend] 🎙️ STT language from client: {stt_lang_param}")
+        logger.info("[Backend] 🎙️ STT language from client: %s", stt_lang_param)
     
-    # 连接统计
+    # 连接统计；心跳时间用事件循环的单调时钟（loop.time()），不受系统时间调整影响
+    loop = asyncio.get_running_loop()
     connection_start_time = time.time()
-    last_heartbeat = time.time()
+    last_heartbeat = loop.time()
 
-    # 存储要发送的消息队列
-    message_queue = []
+    # 出站消息队列（待发送的文本帧及是否为partial字幕），由_message_worker任务消费；
+    # 有界队列，客户端发送过慢时丢弃最旧的消息，避免内存无限增长
+    message_queue: asyncio.Queue = asyncio.Queue(maxsize=256)
+    
+    def put_message(data: str, is_partial: bool = False):
+        """投递待发送消息（仅在事件循环中调用）；队列满时丢弃最旧的一条"""
+        try:
+            message_queue.put_nowait((data, is_partial))
+        except asyncio.QueueFull:
+            message_queue.get_nowait()
+            message_queue.put_nowait((data, is_partial))
+            logger.warning("[Backend] ⚠️ Outbound queue full, dropped oldest message")
+    
+    # 每个连接最多8个并发翻译请求；翻译任务需保留引用，避免执行中被回收
+    translate_semaphore = asyncio.Semaphore(8)
+    translation_tasks = set()
     
     # 语言检测统计
     language_stats = {
@@ -129,8 +224,19 @@ async def stream(ws: WebSocket):
         'language_code': 'en-US',
         'last_update': time.time(),
         'buffer_timeout': 5.0,  # 5秒超时，避免无标点的长句一直缓冲
-        'min_chars_for_punctuation_check': 10  # 最少10个字符才检查标点
+        'min_chars_for_punctuation_check': 10,  # 最少10个字符才检查标点
+        'min_partial_translate_interval': 0.15,  # 标点触发的partial翻译最短间隔（秒），Final不受限
+        'last_partial_translate': 0.0
+    }
+    
+    # partial翻译合并：只保留最新一条待翻译的partial，由_partial_translator任务逐条翻译；
+    # finals计数用于丢弃在Final之后才完成的过期partial翻译
+    latest_partial = {
+        'text': None,
+        'language': 'en-US',
+        'finals': 0
     }
+    partial_event = asyncio.Event()
     
     # 文本去重机制 - 防止相同文本被重复处理
     processed_texts = set()
@@ -154,17 +260,17 @@ async def stream(ws: WebSocket):
         text_key = f"{text.strip()}_{is_final}_{language_code}"
         if text_key in processed_texts or text.strip() == last_processed_text:
             if not is_final:  # 只跳过 Partial 结果的重复
-                print(f"[Backend] 🔄 Skipping duplicate partial text: '{text[:30]}...', Final: {is_final}")
+                logger.debug("[Backend] 🔄 Skipping duplicate partial text: '%.30s...', Final: %s", text, is_final)
                 return
             else:
-                print(f"[Backend] ✅ Processing duplicate final text (final result takes priority): '{text[:30]}...', Final: {is_final}")
+                logger.debug("[Backend] ✅ Processing duplicate final text (final result takes priority): '%.30s...', Final: %s", text, is_final)
                 # Final 结果即使重复也要处理，继续执行
             
         # 智能语言检测
         detected_language = detect_text_language(text, language_code)
         
-        print(f"[Backend] 📝 Processing NEW text: '{text[:50]}{'...' if len(text) > 50 else ''}' "
-              f"(STT: {language_code}, Detected: {detected_language}, Final: {is_final}, Force: {force_translate})")
+        logger.debug("[Backend] 📝 Processing NEW text: '%.50s' (STT: %s, Detected: %s, Final: %s, Force: %s)",
+                     text, language_code, detected_language, is_final, force_translate)
         
         # 决定是否触发翻译 - 更严格的条件
         should_translate = False
@@ -176,11 +282,14 @@ async def stream(ws: WebSocket):
         elif force_translate:
             should_translate = True
             trigger_reason = "force_translate"  
-        elif has_sentence_ending_punctuation(text) and len(text.strip()) >= partial_text_buffer['min_chars_for_punctuation_check']:
-            # 只在partial结果中检测到标点符号时翻译
+        elif (len(text.strip()) >= partial_text_buffer['min_chars_for_punctuation_check'] and
+              time.time() - partial_text_buffer['last_partial_translate'] >= partial_text_buffer['min_partial_translate_interval'] and
+              has_sentence_ending_punctuation(text)):
+            # 只在partial结果中检测到标点符号时翻译（距上次partial翻译过近时等待后续结果，避免连续翻译几乎相同的文本）
             if not is_final:  # 确保这是partial结果
                 should_translate = True
                 trigger_reason = "punctuation_detected"
+                partial_text_buffer['last_partial_translate'] = time.time()
         
         if should_translate:
             # 记录已处理的文本
@@ -192,7 +301,7 @@ async def stream(ws: WebSocket):
                 # 清理最旧的一半记录
                 processed_texts = set(list(processed_texts)[-50:])
             
-            print(f"[Backend] 🚀 Triggering translation - Reason: {trigger_reason}")
+            logger.debug("[Backend] 🚀 Triggering translation - Reason: %s", trigger_reason)
             
             # 更新语言统计
             language_stats['total_results'] += 1
@@ -218,21 +327,27 @@ async def stream(ws: WebSocket):
             if len(language_stats['last_detected_languages']) > 10:
                 language_stats['last_detected_languages'].pop(0)
             
-            # 添加到翻译队列
-            message_queue.append(('smart_translate', {'text': text, 'language': detected_language, 'is_final': is_final}))
+            # 立即在事件循环中启动翻译（ASR回调线程或事件循环中调用均可）
+            loop.call_soon_threadsafe(start_translation, text, detected_language, is_final)
             
             # 清空缓冲区
             partial_text_buffer['content'] = ''
             partial_text_buffer['last_update'] = time.time()
         else:
-            print(f"[Backend] 📋 Not translating - Text: '{text[:30]}...', Length: {len(text)}, Has punct: {has_sentence_ending_punctuation(text)}, Final: {is_final}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[Backend] 📋 Not translating - Text: '%.30s...', Length: %d, Has punct: %s, Final: %s",
+                             text, len(text), has_sentence_ending_punctuation(text), is_final)
 
     # ASR 回调 - 支持智能标点触发翻译
     def on_partial(text: str, language_code: str):
-        print(f"[Backend] 📄 ASR partial: '{text}' (lang: {language_code}, len: {len(text)})")
+        logger.debug("[Backend] 📄 ASR partial: '%s' (lang: %s, len: %d)", text, language_code, len(text))
         
         if len(text.strip()) == 0:
             return
+        
+        # 与上一条partial完全相同（ASR常重复发送）：缓冲区无需更新，也不会触发新的翻译
+        if text == partial_text_buffer['content']:
+            return
             
         # 更新缓冲区
         partial_text_buffer['content'] = text
@@ -243,16 +358,17 @@ async def stream(ws: WebSocket):
         process_text_for_translation(text, language_code, is_final=False, force_translate=False)
 
     def on_final(text: str, language_code: str):
-        print(f"[Backend] ✅ ASR final: '{text}' (lang: {language_code}, len: {len(text)})")
+        logger.debug("[Backend] ✅ ASR final: '%s' (lang: %s, len: %d)", text, language_code, len(text))
         
         if len(text.strip()) > 0:
             # Final结果始终触发翻译
             process_text_for_translation(text, language_code, is_final=True, force_translate=False)
         else:
-            print(f"[Backend] Final text is empty, not processing")
+            logger.debug("[Backend] Final text is empty, not processing")
 
 
-    async def smart_translate_and_update(text: str, language_code: str, is_final: bool = True, retry_count: int = 0):
+    async def smart_translate_and_update(text: str, language_code: str, is_final: bool = True, retry_count: int = 0,
+                                         finals_before: int | None = None):
         """智能翻译函数 - 根据检测到的语言决定是否翻译（增强版含去重）"""
         nonlocal last_sent_translation
         max_retries = 1
@@ -262,25 +378,27 @@ async def stream(ws: WebSocket):
             final_language = detect_text_language(text, language_code)
             has_chinese = contains_chinese_chars(text)
             
-            print(f"[Backend] 🧠 Smart translate (attempt {retry_count + 1}): '{text[:50]}{'...' if len(text) > 50 else ''}' "
-                  f"(Input lang: {language_code}, Final lang: {final_language}, Has Chinese chars: {has_chinese})")
+            logger.debug("[Backend] 🧠 Smart translate (attempt %d): '%.50s' (Input lang: %s, Final lang: %s, Has Chinese chars: %s)",
+                         retry_count + 1, text, language_code, final_language, has_chinese)
             
             start_time = time.time()
             
             # 翻译方向由插件模式决定（不再依赖自动语言检测）
             if translate_mode == 'en2zh':
                 # 识别英文 -> 翻译中文
-                translated = await translate_en_to_zh_async(text, max_retries=2)
+                async with translate_semaphore:
+                    translated = await translate_en_to_zh_async(text, max_retries=2)
                 elapsed_time = time.time() - start_time
-                print(f"[Backend] 🇺🇸 EN→ZH done in {elapsed_time:.2f}s: '{text}' -> '{translated}'")
+                logger.debug("[Backend] 🇺🇸 EN→ZH done in %.2fs: '%s' -> '%s'", elapsed_time, text, translated)
                 display_lang = 'zh'
                 payload_en = text
                 payload_zh = translated
             else:
                 # 识别中文 -> 翻译英文
-                translated = await translate_zh_to_en_async(text, max_retries=2)
+                async with translate_semaphore:
+                    translated = await translate_zh_to_en_async(text, max_retries=2)
                 elapsed_time = time.time() - start_time
-                print(f"[Backend] 🇨🇳 ZH→EN done in {elapsed_time:.2f}s: '{text}' -> '{translated}'")
+                logger.debug("[Backend] 🇨🇳 ZH→EN done in %.2fs: '%s' -> '%s'", elapsed_time, text, translated)
                 display_lang = 'en'
                 payload_en = translated
                 payload_zh = text
@@ -289,277 +407,367 @@ async def stream(ws: WebSocket):
             translation_key = f"{text.strip()}_{(payload_zh if translate_mode=='en2zh' else payload_en).strip()}"
             if translation_key == last_sent_translation:
                 if not is_final:
-                    print(f"[Backend] 🔄 Skipping duplicate translation result")
+                    logger.debug("[Backend] 🔄 Skipping duplicate translation result")
                     return
                 else:
                     pass
+            
+            # partial翻译期间已有Final入队：该partial已过期，不再发送
+            if not is_final and finals_before is not None and finals_before != latest_partial['finals']:
+                logger.debug("[Backend] 🔄 Dropping stale partial translation: '%.30s...'", text)
+                return
                 
             last_sent_translation = translation_key
             
             # 发送结果
-            data = json.dumps({
-                "en": payload_en,
-                "zh": payload_zh,
-                "isFinal": is_final,
-                "display": display_lang
-            }, ensure_ascii=False)
-            message_queue.append(('send', data))
+            data = _subtitle_payload(payload_en, payload_zh, is_final, display_lang)
+            put_message(data, is_partial=not is_final)
             
             # 增强日志记录
-            final_status = "FINAL" if is_final else "PARTIAL"
-            char_analysis = f"Chinese chars: {has_chinese}, Lang detection: {final_language}"
-            print(f"[Backend] 📤 NEW translation queued ({len(zh_text)} chars) - {char_analysis} - Status: {final_status}")
+            logger.debug("[Backend] 📤 NEW translation queued (%d chars) - Chinese chars: %s, Lang detection: %s - Status: %s",
+                         len(translated), has_chinese, final_language, "FINAL" if is_final else "PARTIAL")
             
         except Exception as e:
             error_type = type(e).__name__
-            print(f"[Backend] ❌ Smart translation error ({error_type}): {e}")
+            logger.warning("[Backend] ❌ Smart translation error (%s): %s", error_type, e)
             
             if retry_count < max_retries:
-                print(f"[Backend] 🔄 Retrying smart translation ({retry_count + 1}/{max_retries})")
+                logger.info("[Backend] 🔄 Retrying smart translation (%d/%d)", retry_count + 1, max_retries)
                 await asyncio.sleep(1.0 * (retry_count + 1))
-                await smart_translate_and_update(text, language_code, is_final, retry_count + 1)
+                await smart_translate_and_update(text, language_code, is_final, retry_count + 1, finals_before)
             else:
                 final_status = "FINAL" if is_final else "PARTIAL"
-                print(f"[Backend] ❌ Smart translation failed after {max_retries + 1} attempts, sending original text - Status: {final_status}")
+                logger.error("[Backend] ❌ Smart translation failed after %d attempts, sending original text - Status: %s", max_retries + 1, final_status)
                 # 发送原文作为最后选择
                 # 失败时仍按显示语言输出
                 if translate_mode == 'en2zh':
-                    data = json.dumps({"en": text, "zh": text, "isFinal": is_final, "display": "zh"}, ensure_ascii=False)
+                    data = _subtitle_payload(text, text, is_final, "zh")
                 else:
-                    data = json.dumps({"en": text, "zh": text, "isFinal": is_final, "display": "en"}, ensure_ascii=False)
-                message_queue.append(('send', data))
+                    data = _subtitle_payload(text, text, is_final, "en")
+                put_message(data, is_partial=not is_final)
 
     # 显示STT引擎状态
     STTFactory.print_engine_status()
     
-    print(f"[Backend] Creating STT stream using GOOGLE engine (single-language)")
+    logger.info("[Backend] Creating STT stream using %s engine (single-language)", _STREAM_STT_ENGINE.value.upper())
     stt = None
+    stt_lock = threading.Lock()
+    stt_closing = False  # 连接结束后置位，阻止线程池中排队的重建再创建新流
     stt_rebuild_count = 0
     max_rebuild_attempts = 5
     
-    def create_stt_instance():
+    def create_stt_instance(stale=None):
+        """关闭旧流并创建、连接新的STT流（在_stt_executor线程中调用，加锁避免推送与健康检查同时重建）
+
+        stale为调用方判定需要重建的流；等待锁期间若已被另一方重建，直接返回当前流而不再重复重建。
+        返回已连接的STT流，连接已关闭或创建失败时返回None
+        """
         nonlocal stt, stt_rebuild_count
-        try:
-            if stt:
-                print(f"[Backend] Closing existing STT stream")
-                stt.close()
+        with stt_lock:
+            if stt_closing:
+                return None
+            if stale is not None and stt is not stale:
+                logger.debug("[Backend] STT stream already rebuilt by another task")
+                return stt
+            try:
+                if stt:
+                    logger.info("[Backend] Closing existing STT stream")
+                    stt.close()
             
-            stt_rebuild_count += 1
-            print(f"[Backend] Creating STT stream (attempt {stt_rebuild_count})")
+                stt_rebuild_count += 1
+                logger.info("[Backend] Creating STT stream (attempt %d)", stt_rebuild_count)
             
-            # 使用工厂模式创建STT流
-            if stt_lang_param:
-                primary_lang = stt_lang_param
-            else:
-                primary_lang = 'en-US' if translate_mode == 'en2zh' else 'zh-CN'
-            alt_langs = []  # 按需仅识别单一语种
+                # 使用工厂模式创建STT流
+                if stt_lang_param:
+                    primary_lang = stt_lang_param
+                else:
+                    primary_lang = 'en-US' if translate_mode == 'en2zh' else 'zh-CN'
+                alt_langs = []  # 按需仅识别单一语种
 
-            stt = create_stt_stream(
-                on_partial=on_partial,
-                on_final=on_final,
-                engine="google",
-                language=primary_lang,
-                alternative_languages=alt_langs,
-                debug=Config.DEBUG_MODE
-            )
+                stt = create_stt_stream(
+                    on_partial=on_partial,
+                    on_final=on_final,
+                    engine=_STREAM_STT_ENGINE.value,
+                    language=primary_lang,
+                    alternative_languages=alt_langs,
+                    debug=Config.DEBUG_MODE
+                )
             
-            # 连接到STT服务
-            if stt.connect():
-                print(f"[Backend] ✅ STT stream created and connected successfully ({stt.__class__.__name__})")
-                return True
-            else:
-                print(f"[Backend] ❌ STT stream created but failed to connect")
-                return False
+                # 连接到STT服务
+                if stt.connect():
+                    logger.info("[Backend] ✅ STT stream created and connected successfully (%s)", stt.__class__.__name__)
+                    return stt
+                else:
+                    logger.error("[Backend] ❌ STT stream created but failed to connect")
+                    return None
                 
-        except Exception as e:
-            print(f"[Backend] ❌ Failed to create STT stream: {e}")
-            return False
+            except Exception as e:
+                logger.error("[Backend] ❌ Failed to create STT stream: %s", e)
+                return None
+    
+    def close_stt_instance():
+        """连接结束时关闭STT流：持锁执行，等待进行中的重建完成后关闭其创建的流"""
+        nonlocal stt_closing
+        with stt_lock:
+            stt_closing = True
+            if stt:
+                stt.close()
     
     def should_rebuild_stt():
         """检查是否需要重建STT流"""
         if not stt:
             return True
         if stt_rebuild_count >= max_rebuild_attempts:
-            print(f"[Backend] ⚠️ Max STT rebuild attempts ({max_rebuild_attempts}) reached")
+            logger.warning("[Backend] ⚠️ Max STT rebuild attempts (%d) reached", max_rebuild_attempts)
             return False
         return True
     
+    def start_translation(text: str, language: str, is_final: bool):
+        """在事件循环中启动翻译：Final立即创建翻译任务，partial交给_partial_translator合并"""
+        if is_final:
+            # Final不参与合并，立即翻译；尚未翻译的partial已被它取代
+            latest_partial['finals'] += 1
+            latest_partial['text'] = None
+            task = asyncio.create_task(smart_translate_and_update(text, language, is_final))
+            translation_tasks.add(task)
+            task.add_done_callback(translation_tasks.discard)
+            logger.debug("[Backend] 🧠 Started smart translation task for: '%s' (lang: %s, final: %s)", text, language, is_final)
+        else:
+            # partial只更新最新文本，翻译中到达的中间结果会被下一次翻译覆盖
+            latest_partial['text'] = text
+            latest_partial['language'] = language
+            partial_event.set()
+    
+    async def _message_worker():
+        """出站消息任务：等待队列中的消息并逐条发送到客户端；上一次发送期间的积压先合并过时的partial"""
+        while True:
+            backlog = [await message_queue.get()]
+            while not message_queue.empty():
+                backlog.append(message_queue.get_nowait())
+            if len(backlog) > 1:
+                messages = _coalesce_backlog(backlog)
+                if len(messages) < len(backlog):
+                    logger.debug("[Backend] 🔄 Dropped %d superseded partial(s) from backlog", len(backlog) - len(messages))
+            else:
+                messages = [backlog[0][0]]
+            for data in messages:
+                try:
+                    await ws.send_text(data)
+                    logger.debug("[Backend] ✅ Sent queued message: %s", data)
+                except Exception as send_error:
+                    logger.warning("[Backend] ❌ Failed to send queued message: %s", send_error)
+    
+    async def _partial_translator():
+        """partial翻译任务：每次只翻译最新的partial，翻译期间到达的中间结果被合并"""
+        while True:
+            await partial_event.wait()
+            partial_event.clear()
+            text = latest_partial['text']
+            latest_partial['text'] = None
+            if text:
+                await smart_translate_and_update(text, latest_partial['language'], is_final=False,
+                                                 finals_before=latest_partial['finals'])
+    
+    # 接收循环与STT推送之间的有界音频队列：STT推送或重建变慢时不阻塞WebSocket接收
+    audio_queue: asyncio.Queue = asyncio.Queue(maxsize=32)
+    
+    def push_audio(audio_data: bytes):
+        """推送一段音频到STT，必要时重建STT流"""
+        bytes_len = len(audio_data)
+        # 只读取一次当前流：健康检查可能在其他线程中替换stt
+        current = stt
+        # 智能STT推送 - 减少对不健康流的压力
+        if current and current.is_healthy():
+            success = current.push(audio_data)
+            if not success:
+                logger.warning("[Backend] ⚠️ Failed to push %d bytes to STT", bytes_len)
+                # 检查是否需要重建
+                if not current.is_healthy() and should_rebuild_stt():
+                    logger.warning("[Backend] 🔄 STT stream unhealthy, rebuilding...")
+                    rebuilt = create_stt_instance(stale=current)
+                    if rebuilt:
+                        # 重试推送，但不强制
+                        rebuilt.push(audio_data)
+        else:
+            # STT流不健康 - 减少重建频率以避免过度压力
+            if should_rebuild_stt():
+                if current:
+                    stats = current.get_stats()
+                    logger.warning("[Backend] 📊 STT unhealthy, stats: runtime=%.1fs, repeat_count=%s, queue_size=%s",
+                                   stats.get('runtime', 0), stats.get('repeat_count', 0),
+                                   stats.get('queue_size', 0))
+                
+                logger.info("[Backend] 🔄 Attempting STT stream rebuild...")
+                rebuilt = create_stt_instance(stale=current)
+                if rebuilt:
+                    # 只在重建成功后推送
+                    rebuilt.push(audio_data)
+                else:
+                    logger.error("[Backend] ❌ STT rebuild failed, dropping %d bytes", bytes_len)
+            else:
+                # 达到重建上限，丢弃数据以避免内存积累
+                if bytes_len > 5000:  # 只对大数据包记录日志
+                    logger.debug("[Backend] 🗑️ STT unavailable, dropping %d bytes audio data", bytes_len)
+    
+    async def _audio_pusher():
+        """音频推送任务：按顺序将接收到的音频推送到STT"""
+        while True:
+            audio_data = await audio_queue.get()
+            try:
+                await loop.run_in_executor(_stt_executor, push_audio, audio_data)
+            except Exception as push_error:
+                logger.warning("[Backend] ❌ Failed to push audio to STT: %s", push_error)
+    
     # 初始创建STT流
-    if not create_stt_instance():
-        print("[Backend] ❌ Failed to create initial STT stream")
+    if not await loop.run_in_executor(_stt_executor, create_stt_instance):
+        logger.error("[Backend] ❌ Failed to create initial STT stream")
         return
+    
+    message_worker = asyncio.create_task(_message_worker())
+    partial_translator = asyncio.create_task(_partial_translator())
+    audio_pusher = asyncio.create_task(_audio_pusher())
 
-    # 健康检查计时器
-    last_health_check = time.time()
-    health_check_interval = 60  # 每分钟检查一次
-
-    try:
+    async def _health_loop():
+        """健康检查任务：每分钟检查STT和心跳并输出统计；心跳超时时返回以结束连接"""
         while True:
-            # 定期健康检查和统计报告
+            await asyncio.sleep(health_check_interval)
             now = time.time()
-            if now - last_health_check > health_check_interval:
-                if stt:
-                    stt_stats = stt.get_stats()
-                    print(f"[Backend] 📊 STT Health Check: {stt_stats}")
-                    
-                    if not stt.is_healthy():
-                        print(f"[Backend] ⚠️ STT health check failed, may need rebuild")
-                        if should_rebuild_stt():
-                            create_stt_instance()
+            heartbeat_age = loop.time() - last_heartbeat
+            # 5分钟没有收到心跳PING则断开连接
+            if heartbeat_age > 300:
+                logger.warning("[Backend] ⚠️ Heartbeat timeout, closing connection")
+                return
+            
+            current = stt
+            if current:
+                stt_stats = current.get_stats()
+                logger.info("[Backend] 📊 STT Health Check: %s", stt_stats)
                 
-                # 翻译统计报告
-                try:
-                    translation_stats = get_translation_stats()
-                    print(f"[Backend] 📈 Translation Stats: Cache:{translation_stats['cache_size']}/{translation_stats['max_cache_size']}, "
-                          f"Requests:{translation_stats['total_requests']}, "
-                          f"Hit Rate:{translation_stats['cache_hit_rate']:.1f}%, "
-                          f"Success Rate:{translation_stats['success_rate']:.1f}%, "
-                          f"Failures:{translation_stats['failures']}, "
-                          f"Retries:{translation_stats['retries']}")
-                except Exception as stats_error:
-                    print(f"[Backend] ⚠️ Failed to get translation stats: {stats_error}")
+                if not current.is_healthy():
+                    logger.warning("[Backend] ⚠️ STT health check failed, may need rebuild")
+                    if should_rebuild_stt():
+                        await loop.run_in_executor(_stt_executor, create_stt_instance, current)
+            
+            # 翻译统计报告
+            try:
+                translation_stats = get_translation_stats()
+                logger.info("[Backend] 📈 Translation Stats: Cache:%d/%d, Requests:%d, Hit Rate:%.1f%%, "
+                            "Success Rate:%.1f%%, Failures:%d, Retries:%d",
+                            translation_stats['cache_size'], translation_stats['max_cache_size'],
+                            translation_stats['total_requests'], translation_stats['cache_hit_rate'],
+                            translation_stats['success_rate'], translation_stats['failures'],
+                            translation_stats['retries'])
+            except Exception as stats_error:
+                logger.warning("[Backend] ⚠️ Failed to get translation stats: %s", stats_error)
+            
+            # 连接统计
+            connection_duration = now - connection_start_time
+            logger.info("[Backend] ⏱️ Connection Stats: Duration:%.1fs, Queue Size:%d, Last Heartbeat:%.1fs ago",
+                        connection_duration, message_queue.qsize(), heartbeat_age)
+            
+            # 检查缓冲区超时 - 处理没有标点的长句
+            if (partial_text_buffer['content'] and 
+                now - partial_text_buffer['last_update'] > partial_text_buffer['buffer_timeout'] and
+                len(partial_text_buffer['content'].strip()) > 5):
                 
-                # 连接统计
-                connection_duration = now - connection_start_time
-                print(f"[Backend] ⏱️ Connection Stats: Duration:{connection_duration:.1f}s, "
-                      f"Queue Size:{len(message_queue)}, "
-                      f"Last Heartbeat:{now - last_heartbeat:.1f}s ago")
+                logger.info("[Backend] ⏰ Buffer timeout, force translating: '%.50s...'", partial_text_buffer['content'])
+                process_text_for_translation(
+                    partial_text_buffer['content'], 
+                    partial_text_buffer['language_code'], 
+                    is_final=False, 
+                    force_translate=True
+                )
+            
+            # 语言检测统计报告（增强版）
+            if language_stats['total_results'] > 0:
+                chinese_pct = (language_stats['chinese_count'] / language_stats['total_results']) * 100
+                english_pct = (language_stats['english_count'] / language_stats['total_results']) * 100
+                other_pct = (language_stats['other_count'] / language_stats['total_results']) * 100
+                logger.info("[Backend] 🗣️ Language Stats: Total:%d, Chinese:%d(%.1f%%), English:%d(%.1f%%), Other:%d(%.1f%%)",
+                            language_stats['total_results'],
+                            language_stats['chinese_count'], chinese_pct,
+                            language_stats['english_count'], english_pct,
+                            language_stats['other_count'], other_pct)
                 
-                # 检查缓冲区超时 - 处理没有标点的长句
-                if (partial_text_buffer['content'] and 
-                    now - partial_text_buffer['last_update'] > partial_text_buffer['buffer_timeout'] and
-                    len(partial_text_buffer['content'].strip()) > 5):
-                    
-                    print(f"[Backend] ⏰ Buffer timeout, force translating: '{partial_text_buffer['content'][:50]}...'")
-                    process_text_for_translation(
-                        partial_text_buffer['content'], 
-                        partial_text_buffer['language_code'], 
-                        is_final=False, 
-                        force_translate=True
-                    )
+                # 显示最近的语言检测结果（增强版）
+                if language_stats['last_detected_languages']:
+                    recent = language_stats['last_detected_languages'][-3:]  # 最近3个
+                    recent_info = [f"{r['type']}({r['trigger_reason']}):'{r['text_preview']}'" for r in recent]
+                    logger.info("[Backend] 🕐 Recent Languages: %s", ', '.join(recent_info))
                 
-                # 语言检测统计报告（增强版）
-                if language_stats['total_results'] > 0:
-                    chinese_pct = (language_stats['chinese_count'] / language_stats['total_results']) * 100
-                    english_pct = (language_stats['english_count'] / language_stats['total_results']) * 100
-                    other_pct = (language_stats['other_count'] / language_stats['total_results']) * 100
-                    print(f"[Backend] 🗣️ Language Stats: Total:{language_stats['total_results']}, "
-                          f"Chinese:{language_stats['chinese_count']}({chinese_pct:.1f}%), "
-                          f"English:{language_stats['english_count']}({english_pct:.1f}%), "
-                          f"Other:{language_stats['other_count']}({other_pct:.1f}%)")
+                # 缓冲区状态报告
+                logger.info("[Backend] 📋 Buffer: %d chars, Age: %.1fs",
+                            len(partial_text_buffer['content']), now - partial_text_buffer['last_update'])
+    
+    async def _receive_loop():
+        """接收任务：读取客户端消息，音频交给_audio_pusher，PING回复PONG；客户端断开时返回"""
+        nonlocal last_heartbeat
+        while True:
+            msg = await ws.receive()
+            if msg["type"] == "websocket.disconnect":
+                logger.info("[Backend] WebSocket disconnect received")
+                break
+            if "bytes" in msg and msg["bytes"]:
+                bytes_len = len(msg['bytes'])
+                if bytes_len > 0:
+                    # 优化音频数据处理 - 添加质量控制和流量管理
                     
-                    # 显示最近的语言检测结果（增强版）
-                    if language_stats['last_detected_languages']:
-                        recent = language_stats['last_detected_languages'][-3:]  # 最近3个
-                        recent_info = [f"{r['type']}({r['trigger_reason']}):'{r['text_preview']}'" for r in recent]
-                        print(f"[Backend] 🕐 Recent Languages: {', '.join(recent_info)}")
+                    # 基本音频质量检查（简单的静音检测）
+                    audio_data = msg["bytes"]
                     
-                    # 缓冲区状态报告
-                    buffer_status = f"Buffer: {len(partial_text_buffer['content'])} chars, Age: {now - partial_text_buffer['last_update']:.1f}s"
-                    print(f"[Backend] 📋 {buffer_status}")
-                      
-                last_health_check = now
-            
-            # 检查并处理队列中的消息和翻译任务
-            while message_queue:
-                try:
-                    item = message_queue.pop(0)
-                    if isinstance(item, tuple) and len(item) == 2:
-                        action, data = item
-                        if action == 'smart_translate':
-                            # 启动智能翻译任务
-                            text = data['text']
-                            language = data['language']
-                            is_final = data.get('is_final', True)  # 默认为True保持兼容性
-                            asyncio.create_task(smart_translate_and_update(text, language, is_final))
-                            print(f"[Backend] 🧠 Started smart translation task for: '{text}' (lang: {language}, final: {is_final})")
-                        elif action == 'send':
-                            # 发送消息
-                            await ws.send_text(data)
-                            print(f"[Backend] ✅ Sent translated message: {data}")
+                    # 检查是否为静音数据（所有字节都接近0）
+                    is_likely_silent = all(abs(b - 128) < 10 for b in audio_data[:min(100, len(audio_data))])  # 检查前100字节
+                    
+                    if is_likely_silent and bytes_len < 1000:  # 小的静音数据包可能不重要
+                        logger.debug("[Backend] 🔇 Skipping likely silent audio data: %d bytes", bytes_len)
                     else:
-                        # 普通消息
-                        await ws.send_text(item)
-                        print(f"[Backend] ✅ Sent queued message: {item}")
-                except Exception as send_error:
-                    print(f"[Backend] ❌ Failed to process queued item: {send_error}")
-            
-            # 使用短超时接收消息，避免阻塞消息发送
-            try:
-                msg = await asyncio.wait_for(ws.receive(), timeout=0.1)
-                if msg["type"] == "websocket.disconnect":
-                    print("[Backend] WebSocket disconnect received")
-                    break
-                if "bytes" in msg and msg["bytes"]:
-                    bytes_len = len(msg['bytes'])
-                    if bytes_len > 0:
-                        # 优化音频数据处理 - 添加质量控制和流量管理
+                        # 减少日志频率以降低I/O压力
+                        if bytes_len % 32000 == 0:  # 每32KB记录一次
+                            logger.debug("[Backend] 📡 Processing audio data: %d bytes", bytes_len)
                         
-                        # 基本音频质量检查（简单的静音检测）
-                        audio_data = msg["bytes"]
-                        
-                        # 检查是否为静音数据（所有字节都接近0）
-                        is_likely_silent = all(abs(b - 128) < 10 for b in audio_data[:min(100, len(audio_data))])  # 检查前100字节
-                        
-                        if is_likely_silent and bytes_len < 1000:  # 小的静音数据包可能不重要
-                            print(f"[Backend] 🔇 Skipping likely silent audio data: {bytes_len} bytes")
-                        else:
-                            # 减少日志频率以降低I/O压力
-                            if bytes_len % 32000 == 0:  # 每32KB记录一次
-                                print(f"[Backend] 📡 Processing audio data: {bytes_len} bytes")
-                            
-                            # 智能STT推送 - 减少对不健康流的压力
-                            if stt and stt.is_healthy():
-                                success = stt.push(audio_data)
-                                if not success:
-                                    print(f"[Backend] ⚠️ Failed to push {bytes_len} bytes to STT")
-                                    # 检查是否需要重建
-                                    if not stt.is_healthy() and should_rebuild_stt():
-                                        print(f"[Backend] 🔄 STT stream unhealthy, rebuilding...")
-                                        if create_stt_instance():
-                                            # 重试推送，但不强制
-                                            stt.push(audio_data)
-                            else:
-                                # STT流不健康 - 减少重建频率以避免过度压力
-                                if should_rebuild_stt():
-                                    if stt:
-                                        stats = stt.get_stats()
-                                        print(f"[Backend] 📊 STT unhealthy, stats: runtime={stats.get('runtime', 0):.1f}s, "
-                                              f"repeat_count={stats.get('repeat_count', 0)}, "
-                                              f"queue_size={stats.get('queue_size', 0)}")
-                                    
-                                    print(f"[Backend] 🔄 Attempting STT stream rebuild...")
-                                    if create_stt_instance():
-                                        # 只在重建成功后推送
-                                        stt.push(audio_data)
-                                    else:
-                                        print(f"[Backend] ❌ STT rebuild failed, dropping {bytes_len} bytes")
-                                else:
-                                    # 达到重建上限，丢弃数据以避免内存积累
-                                    if bytes_len > 5000:  # 只对大数据包记录日志
-                                        print(f"[Backend] 🗑️ STT unavailable, dropping {bytes_len} bytes audio data")
-                    else:
-                        print(f"[Backend] ⚠️ Received empty audio data")
-                elif "text" in msg and msg["text"] == "PING":
-                    last_heartbeat = time.time()
-                    print("[Backend] 💓 Received heartbeat PING, sending PONG")
-                    message_queue.append(('send', "PONG"))
+                        # 交给_audio_pusher任务推送到STT；队列满时丢弃最旧的音频，保证延迟有上界
+                        try:
+                            audio_queue.put_nowait(audio_data)
+                        except asyncio.QueueFull:
+                            audio_queue.get_nowait()
+                            audio_queue.put_nowait(audio_data)
+                            logger.debug("[Backend] ⚠️ Audio queue full, dropped oldest chunk")
                 else:
-                    print(f"[Backend] Received unknown message type: {msg}")
-            except asyncio.TimeoutError:
-                # 超时是正常的，继续循环检查消息队列
-                # 同时检查心跳超时（5分钟没有心跳就断开连接）
-                if time.time() - last_heartbeat > 300:
-                    print("[Backend] ⚠️ Heartbeat timeout, closing connection")
-                    break
-                pass
+                    logger.debug("[Backend] ⚠️ Received empty audio data")
+            elif "text" in msg and msg["text"] == "PING":
+                last_heartbeat = loop.time()
+                logger.debug("[Backend] 💓 Received heartbeat PING, sending PONG")
+                put_message("PONG")
+            else:
+                logger.debug("[Backend] Received unknown message type: %s", msg)
+
+    # 接收与健康检查各为独立任务，任一结束（客户端断开或心跳超时）即关闭连接
+    health_check_interval = 60  # 每分钟检查一次
+    receive_task = asyncio.create_task(_receive_loop())
+    health_task = asyncio.create_task(_health_loop())
+
+    try:
+        done, _ = await asyncio.wait({receive_task, health_task}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is not None:
+                logger.error("[Backend] WebSocket error: %s", task.exception())
     except Exception as e:
-        print(f"[Backend] WebSocket error: {e}")
+        logger.error("[Backend] WebSocket error: %s", e)
     finally:
         connection_duration = time.time() - connection_start_time
-        print(f"[Backend] Connection closed after {connection_duration:.1f} seconds")
-        print("[Backend] Closing STT stream and WebSocket")
-        stt.close()
+        logger.info("[Backend] Connection closed after %.1f seconds", connection_duration)
+        logger.info("[Backend] Closing STT stream and WebSocket")
+        # 先置位再取消：取消任务不会中止已提交到线程池的推送/重建，置位后排队中的重建不再创建新流
+        stt_closing = True
+        receive_task.cancel()
+        health_task.cancel()
+        message_worker.cancel()
+        partial_translator.cancel()
+        audio_pusher.cancel()
+        await asyncio.gather(receive_task, health_task, message_worker, partial_translator, audio_pusher,
+                             return_exceptions=True)
+        # 持锁关闭：若仍有重建在线程中进行，等待其结束后关闭它创建的流
+        await loop.run_in_executor(_stt_executor, close_stt_instance)
         try:
             await ws.close()
         except Exception:
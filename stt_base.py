@@ -68,11 +68,12 @@ class STTStreamBase(ABC):
             "total_partial_results": 0,
             "total_final_results": 0,
             "total_errors": 0,
-            "last_activity_time": None,
             "connection_count": 0,
             "reconnection_count": 0
         }
         self._stats_lock = threading.Lock()
+        # 最后活动时间（单调时钟，仅用于计算空闲时长；get_stats中换算为时间戳）
+        self._last_activity: Optional[float] = None
         
         # 健康检查
         self._last_heartbeat = time.time()
@@ -158,8 +159,8 @@ class STTStreamBase(ABC):
         
         # 检查活动时间
         with self._stats_lock:
-            if self._stats["last_activity_time"]:
-                idle_time = time.time() - self._stats["last_activity_time"]
+            if self._last_activity is not None:
+                idle_time = time.monotonic() - self._last_activity
                 if idle_time > self._max_idle_time:
                     if self.debug:
                         print(f"[STTBase] 不健康：空闲时间过长 ({idle_time:.1f}s)")
@@ -182,6 +183,7 @@ class STTStreamBase(ABC):
         """获取统计信息"""
         with self._stats_lock:
             stats = self._stats.copy()
+            last_activity = self._last_activity
             
         # 计算运行时间
         if stats["start_time"]:
@@ -189,11 +191,13 @@ class STTStreamBase(ABC):
         else:
             stats["runtime"] = 0
             
-        # 计算活动状态
-        if stats["last_activity_time"]:
-            stats["idle_time"] = time.time() - stats["last_activity_time"]
+        # 计算活动状态（last_activity_time以墙钟时间戳输出，与start_time一致）
+        if last_activity is not None:
+            stats["idle_time"] = time.monotonic() - last_activity
+            stats["last_activity_time"] = time.time() - stats["idle_time"]
         else:
             stats["idle_time"] = None
+            stats["last_activity_time"] = None
             
         stats["status"] = self.get_status().value
         stats["is_healthy"] = self.is_healthy()
@@ -209,10 +213,10 @@ class STTStreamBase(ABC):
                 "total_partial_results": 0,
                 "total_final_results": 0,
                 "total_errors": 0,
-                "last_activity_time": time.time(),
                 "connection_count": 0,
                 "reconnection_count": 0
             }
+            self._last_activity = time.monotonic()
         
         if self.debug:
             print("[STTBase] 统计信息已重置")
@@ -220,9 +224,9 @@ class STTStreamBase(ABC):
     # 内部辅助方法
     
     def _update_activity(self) -> None:
-        """更新最后活动时间"""
+        """更新最后活动时间（单调时钟，不受系统校时影响）"""
         with self._stats_lock:
-            self._stats["last_activity_time"] = time.time()
+            self._last_activity = time.monotonic()
     
     def _increment_stat(self, stat_name: str, increment: int = 1) -> None:
         """增加统计计数"""
@@ -131,6 +131,7 @@ class STTFactory:
                 "smart_format": config.get("smart_format", True),
                 "interim_results": config.get("interim_results", True),
                 "endpointing": config.get("endpointing", 300),
+                "partial_min_delta_chars": config.get("partial_min_delta_chars", 3),
                 "sample_rate": config.get("sample_rate", 16000),
                 "debug": config.get("debug", False)
             }
@@ -177,6 +178,7 @@ class STTFactory:
                 rlang=config.get("rlang", "en_us"),
                 sample_rate=config.get("sample_rate", 16000),
                 debug=config.get("debug", False),
+                silence_threshold=config.get("silence_threshold", 0),
             )
         except ImportError as e:
             raise ImportError(f"讯飞依赖缺失: {e}")
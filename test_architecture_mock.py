@@ -244,6 +244,9 @@ class ArchitectureTestCase(unittest.TestCase):
         self.assertGreaterEqual(stats['total_bytes_sent'], total_expected)
         self.assertGreater(stats['runtime'], 0)
         self.assertEqual(stats['connection_count'], 1)
+        # last_activity_time是与start_time同一时钟的时间戳，idle_time为非负时长
+        self.assertAlmostEqual(stats['last_activity_time'], time.time(), delta=5)
+        self.assertGreaterEqual(stats['idle_time'], 0)
         
         print(f"✅ 统计追踪正确: {stats['total_bytes_sent']} bytes, {stats['runtime']:.2f}s runtime")
         
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# test_config.py
+"""
+配置系统测试 - 引擎解析缓存与STT配置构建
+"""
+
+import unittest
+from unittest.mock import patch
+
+from config import Config, STTEngine
+
+
+class ConfigCacheTestCase(unittest.TestCase):
+    """引擎缓存与STT配置测试"""
+
+    def tearDown(self):
+        Config.invalidate_cache()
+
+    def test_engine_cache_follows_stt_engine(self):
+        """STT_ENGINE变化后重新解析，无需手动清除缓存"""
+        with patch.object(Config, 'STT_ENGINE', 'deepgram'):
+            self.assertEqual(Config.get_stt_engine(), STTEngine.DEEPGRAM)
+            self.assertEqual(Config.get_stt_engine(), STTEngine.DEEPGRAM)
+        with patch.object(Config, 'STT_ENGINE', 'IFLYTEK'):
+            self.assertEqual(Config.get_stt_engine(), STTEngine.IFLYTEK)
+
+    def test_unknown_engine_falls_back_to_google(self):
+        """未知引擎名回退到Google"""
+        with patch.object(Config, 'STT_ENGINE', 'nope'):
+            self.assertEqual(Config.get_stt_engine(), STTEngine.GOOGLE)
+
+    def test_stt_config_reflects_attribute_changes(self):
+        """类属性变化立即反映在STT配置中"""
+        with patch.object(Config, 'STT_ENGINE', 'deepgram'), \
+             patch.object(Config, 'DEEPGRAM_API_KEY', 'key-1'):
+            self.assertEqual(Config.get_stt_config()['api_key'], 'key-1')
+            with patch.object(Config, 'DEEPGRAM_PARTIAL_MIN_DELTA_CHARS', 7):
+                self.assertEqual(Config.get_stt_config()['partial_min_delta_chars'], 7)
+
+    def test_stt_config_returns_independent_dicts(self):
+        """调用方修改返回值（如STTFactory合并覆盖参数）不影响后续调用"""
+        with patch.object(Config, 'STT_ENGINE', 'iflytek'):
+            config = Config.get_stt_config()
+            config['language'] = 'changed'
+            self.assertNotEqual(Config.get_stt_config()['language'], 'changed')
+            self.assertIn('silence_threshold', config)
+
+
+if __name__ == "__main__":
+    unittest.main()
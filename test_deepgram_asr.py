@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# test_deepgram_asr.py
+"""
+Deepgram STT流测试 - partial节流（无需Deepgram SDK和网络）
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import deepgram_asr
+
+
+def _result(transcript: str, is_final: bool = False):
+    """构造与Deepgram SDK结构一致的转录结果"""
+    return SimpleNamespace(
+        channel=SimpleNamespace(alternatives=[SimpleNamespace(transcript=transcript)]),
+        is_final=is_final,
+    )
+
+
+class PartialThrottleTestCase(unittest.TestCase):
+    """partial_min_delta_chars节流测试"""
+
+    def setUp(self):
+        self.partials = []
+        with patch.object(deepgram_asr, 'DEEPGRAM_AVAILABLE', True), \
+             patch.object(deepgram_asr, 'LiveOptions', dict):
+            self.stream = deepgram_asr.DeepgramSTTStream(
+                on_partial=lambda text, lang: self.partials.append(text),
+                on_final=lambda text, lang: None,
+                api_key="test-key",
+                partial_min_delta_chars=3,
+            )
+
+    def feed(self, *transcripts):
+        for transcript in transcripts:
+            asyncio.run(self.stream._on_message(None, _result(transcript)))
+
+    def test_short_prefix_extension_is_throttled(self):
+        """纯前缀增长且新增少于3个字母数字时不回调"""
+        self.feed("hello", "hello", "hellowo", "hellowor")
+        self.assertEqual(self.partials, ["hello", "hellowor"])
+
+    def test_revision_is_always_emitted(self):
+        """修订已回调文本的partial即使只差1个字符也回调"""
+        self.feed("I want to by", "I want to buy")
+        self.feed("hello world", "hello word")
+        self.assertEqual(self.partials, ["I want to by", "I want to buy", "hello world", "hello word"])
+
+    def test_cjk_revision_is_always_emitted(self):
+        self.feed("我想买", "我想卖")
+        self.assertEqual(self.partials, ["我想买", "我想卖"])
+
+    def test_punctuation_or_whitespace_is_emitted(self):
+        """新增后缀含标点或空白时不节流"""
+        self.feed("hello", "hello,", "hello, w", "hello, wo")
+        self.assertEqual(self.partials, ["hello", "hello,", "hello, w"])
+        self.feed("我想买", "我想买。")
+        self.assertEqual(self.partials[-1], "我想买。")
+
+    def test_final_resets_throttle(self):
+        """final结束本句后，下一句partial不再与上一句的回调文本比较"""
+        self.feed("hello")
+        asyncio.run(self.stream._on_message(None, _result("hello", is_final=True)))
+        self.feed("helloab")
+        self.assertEqual(self.partials, ["hello", "helloab"])
+
+    def test_zero_disables_throttle(self):
+        self.stream.partial_min_delta_chars = 0
+        self.feed("a", "ab", "abc")
+        self.assertEqual(self.partials, ["a", "ab", "abc"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# test_iflytek_asr.py
+"""
+科大讯飞STT流测试 - 推送路径与PGS结果聚合（无需websocket-client和网络）
+"""
+
+import base64
+import json
+import struct
+import unittest
+from unittest.mock import patch
+
+import iflytek_asr
+from stt_base import STTStatus
+
+# 16kHz/16bit单声道：每40ms 1280字节
+QUIET = struct.pack('<640h', *([50, -60] * 320))
+LOUD = struct.pack('<640h', *([50, -3000] * 320))
+CHUNK_MS = 40
+
+
+def _create_stream(on_partial=None, on_final=None, **kwargs) -> "iflytek_asr.IflytekSTTStream":
+    with patch.object(iflytek_asr, 'IFLYTEK_WS_AVAILABLE', True):
+        return iflytek_asr.IflytekSTTStream(
+            on_partial=on_partial or (lambda text, lang: None),
+            on_final=on_final or (lambda text, lang: None),
+            appid='app', api_key='key', api_secret='secret',
+            **kwargs
+        )
+
+
+class FrameSplitTestCase(unittest.TestCase):
+    """推送切帧与队列溢出"""
+
+    def setUp(self):
+        self.stream = _create_stream()
+        self.frame_size = self.stream._frame_size
+        self.max_frames = self.stream._max_queued_frames
+
+    def frame(self, index: int) -> bytes:
+        """内容可区分的一帧音频"""
+        return struct.pack('<H', index) * (self.frame_size // 2)
+
+    def queued(self) -> list:
+        return [base64.b64decode(f) for f in self.stream._audio_frames]
+
+    def test_push_split_into_frames(self):
+        data = self.frame(1) + self.frame(2) + b"\x03\x00" * 50
+        self.assertTrue(self.stream.push(data))
+        self.assertEqual(self.queued(), [self.frame(1), self.frame(2), b"\x03\x00" * 50])
+
+    def test_overflow_drops_oldest_frames(self):
+        for i in range(self.max_frames):
+            self.stream.push(self.frame(i))
+        self.stream.push(self.frame(1000) + self.frame(1001) + self.frame(1002))
+        queued = self.queued()
+        self.assertEqual(len(queued), self.max_frames)
+        self.assertEqual(queued[0], self.frame(3))
+        self.assertEqual(queued[-3:], [self.frame(1000), self.frame(1001), self.frame(1002)])
+        self.assertEqual(self.stream.get_stats()['dropped_frames'], 3)
+
+    def test_oversized_push_keeps_newest_audio(self):
+        """单次推送超过队列上限时只保留最新的部分"""
+        self.stream.push(self.frame(0))
+        data = b"".join(self.frame(i) for i in range(1, self.max_frames + 3))
+        self.stream.push(data)
+        queued = self.queued()
+        self.assertEqual(len(queued), self.max_frames)
+        self.assertEqual(queued[0], self.frame(3))
+        self.assertEqual(queued[-1], self.frame(self.max_frames + 2))
+        self.assertEqual(self.stream.get_stats()['dropped_frames'], 3)
+
+
+class PgsAggregationTestCase(unittest.TestCase):
+    """动态纠错(PGS)结果聚合"""
+
+    def setUp(self):
+        self.partials = []
+        self.finals = []
+        self.stream = _create_stream(
+            on_partial=lambda text, lang: self.partials.append(text),
+            on_final=lambda text, lang: self.finals.append(text),
+        )
+
+    def receive(self, text: str, status: int = 1, **result):
+        result["ws"] = [{"cw": [{"w": text}]}]
+        message = {"code": 0, "data": {"status": status, "result": result}}
+        self.stream._on_message(None, json.dumps(message))
+
+    def test_apd_appends_segments(self):
+        self.receive("你好", sn=1, pgs="apd")
+        self.receive("世界", sn=2, pgs="apd")
+        self.assertEqual(self.partials, ["你好", "你好世界"])
+
+    def test_rpl_replaces_range(self):
+        self.receive("我想", sn=1, pgs="apd")
+        self.receive("买", sn=2, pgs="apd")
+        self.receive("东西", sn=3, pgs="apd")
+        self.receive("卖东西", sn=4, pgs="rpl", rg=[2, 3])
+        self.assertEqual(self.partials[-1], "我想卖东西")
+
+    def test_same_sn_overwrites(self):
+        self.receive("hello", sn=1)
+        self.receive("hallo", sn=1)
+        self.assertEqual(self.partials, ["hello", "hallo"])
+
+    def test_out_of_order_sn_sorted(self):
+        self.receive("B", sn=2, pgs="apd")
+        self.receive("A", sn=1, pgs="apd")
+        self.assertEqual(self.partials[-1], "AB")
+
+    def test_missing_sn_appends(self):
+        self.receive("A", sn=1)
+        self.receive("B")
+        self.assertEqual(self.partials[-1], "AB")
+
+    def test_final_resets_segments(self):
+        self.receive("你好", sn=1, pgs="apd")
+        self.receive("。", status=2, sn=2, pgs="apd", ls=True)
+        self.assertEqual(self.finals, ["你好。"])
+        self.receive("再见", sn=1, pgs="apd")
+        self.assertEqual(self.partials[-1], "再见")
+
+
+class SilenceSkipTestCase(unittest.TestCase):
+    """静音跳过：vad_eos后的hangover与保活推送"""
+
+    def setUp(self):
+        self.stream = _create_stream(silence_threshold=200, vad_eos=1000)
+        # hangover为vad_eos + 500ms
+        self.hangover_chunks = (1000 + 500) // CHUNK_MS
+
+    def push_quiet(self, count: int):
+        for _ in range(count):
+            self.assertTrue(self.stream.push(QUIET))
+
+    def test_silence_sent_during_hangover(self):
+        """句尾静音在hangover内照常发送，服务端VAD才能检测到句尾"""
+        self.push_quiet(self.hangover_chunks)
+        self.assertEqual(self.stream._bytes_sent_total, self.hangover_chunks * len(QUIET))
+        self.assertEqual(self.stream.get_stats()['skipped_silence_bytes'], 0)
+
+    def test_silence_skipped_after_hangover(self):
+        self.push_quiet(self.hangover_chunks)
+        sent = self.stream._bytes_sent_total
+        self.push_quiet(10)
+        self.assertEqual(self.stream._bytes_sent_total, sent)
+        self.assertEqual(self.stream.get_stats()['skipped_silence_bytes'], 10 * len(QUIET))
+
+    def test_keepalive_sent_while_skipping(self):
+        """连续跳过IFLYTEK_SILENCE_KEEPALIVE_MS后仍发送一次静音，避免服务端空闲断开"""
+        self.push_quiet(self.hangover_chunks + 1)
+        sent = self.stream._bytes_sent_total
+        keepalive_chunks = iflytek_asr.IFLYTEK_SILENCE_KEEPALIVE_MS // CHUNK_MS
+        # 已跳过1个：再跳过keepalive_chunks - 1个后，下一个推送被发送
+        self.push_quiet(keepalive_chunks - 1)
+        self.assertEqual(self.stream._bytes_sent_total, sent)
+        self.push_quiet(1)
+        self.assertEqual(self.stream._bytes_sent_total, sent + len(QUIET))
+        # 之后重新开始计时
+        self.push_quiet(keepalive_chunks)
+        self.assertEqual(self.stream._bytes_sent_total, sent + len(QUIET))
+
+    def test_speech_resets_hangover(self):
+        self.push_quiet(self.hangover_chunks + 5)
+        sent = self.stream._bytes_sent_total
+        self.assertTrue(self.stream.push(LOUD))
+        self.push_quiet(1)
+        self.assertEqual(self.stream._bytes_sent_total, sent + 2 * len(LOUD))
+
+    def test_threshold_zero_disables_skip(self):
+        stream = _create_stream()
+        for _ in range(100):
+            stream.push(QUIET)
+        self.assertEqual(stream.get_stats()['skipped_silence_bytes'], 0)
+        self.assertEqual(stream._bytes_sent_total, 100 * len(QUIET))
+
+    def test_push_fails_after_session_error(self):
+        """服务端关闭会话后push返回False，调用方据此重建"""
+        self.stream._set_status(STTStatus.ERROR)
+        self.assertFalse(self.stream.push(QUIET))
+        self.assertFalse(self.stream.push(LOUD))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# test_main.py
+"""
+后端服务测试 - 出站消息的合并与拼接（需安装requirements.txt中的依赖）
+"""
+
+import json
+import unittest
+
+try:
+    import main
+except ImportError as e:
+    main = None
+    _IMPORT_ERROR = str(e)
+else:
+    _IMPORT_ERROR = ""
+
+
+@unittest.skipIf(main is None, f"main.py依赖未安装: {_IMPORT_ERROR}")
+class CoalesceBacklogTestCase(unittest.TestCase):
+    """积压消息合并测试"""
+
+    def test_single_message_unchanged(self):
+        self.assertEqual(main._coalesce_backlog([("p1", True)]), ["p1"])
+
+    def test_only_newest_partial_kept(self):
+        backlog = [("p1", True), ("p2", True), ("p3", True)]
+        self.assertEqual(main._coalesce_backlog(backlog), ["p3"])
+
+    def test_partial_before_final_dropped(self):
+        """final之前的partial已被final取代；final之后的partial保留"""
+        backlog = [("p1", True), ("f1", False), ("p2", True), ("f2", False), ("p3", True)]
+        self.assertEqual(main._coalesce_backlog(backlog), ["f1", "f2", "p3"])
+
+    def test_all_finals_kept_in_order(self):
+        backlog = [("f1", False), ("f2", False), ("f3", False)]
+        self.assertEqual(main._coalesce_backlog(backlog), ["f1", "f2", "f3"])
+
+    def test_pong_does_not_supersede_partial(self):
+        backlog = [("p1", True), ("PONG", False), ("p2", True), ("PONG", False)]
+        self.assertEqual(main._coalesce_backlog(backlog), ["PONG", "p2", "PONG"])
+
+
+
+@unittest.skipIf(main is None, f"main.py依赖未安装: {_IMPORT_ERROR}")
+class SubtitlePayloadTestCase(unittest.TestCase):
+    """字幕JSON拼接测试：结果须与json.dumps构建的字典等价"""
+
+    def assertPayload(self, en, zh, is_final, display):
+        payload = main._subtitle_payload(en, zh, is_final, display)
+        self.assertEqual(json.loads(payload), {"en": en, "zh": zh, "isFinal": is_final, "display": display})
+
+    def test_partial_and_final(self):
+        self.assertPayload("Hello world.", "你好，世界。", True, "zh")
+        self.assertPayload("Hello", "你好", False, "en")
+
+    def test_escaped_text(self):
+        self.assertPayload('He said "hi"\\n', "换行\n制表\t", False, "zh")
+        self.assertPayload("", "", True, "en")
+
+    def test_non_ascii_and_control_characters(self):
+        self.assertPayload("emoji 😀 \u2028", "\x00\x1f", True, "zh")
+
+    def test_field_order_matches_client_format(self):
+        payload = main._subtitle_payload("a", "b", False, "zh")
+        self.assertEqual(payload, '{"en":"a","zh":"b","isFinal":false,"display":"zh"}')
+
+
+if __name__ == "__main__":
+    unittest.main()
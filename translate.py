@@ -4,9 +4,43 @@ import json
 import aiohttp
 import asyncio
 import requests
+import threading
 from typing import Optional
 from google.cloud import translate_v2 as translate
 
+# 进程内共享的HTTP客户端：复用连接池，省去每次翻译的TCP+TLS握手和凭据加载
+_translate_client: Optional[translate.Client] = None
+_translate_client_lock = threading.Lock()
+_requests_session = requests.Session()
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_translate_client() -> translate.Client:
+    """获取（必要时创建）共享的Google Translate客户端"""
+    global _translate_client
+    if _translate_client is None:
+        with _translate_client_lock:
+            if _translate_client is None:
+                _translate_client = translate.Client()
+    return _translate_client
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """获取（必要时创建）共享的aiohttp会话；需在事件循环中调用"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=4))
+    return _http_session
+
+
+async def close_http_session() -> None:
+    """关闭共享的aiohttp会话（服务关闭时调用）"""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
 def translate_en_to_zh(text: str) -> str:
     """
     使用Google Cloud Translate API进行英译中，如果不可用则降级到MyMemory API
@@ -16,7 +50,7 @@ def translate_en_to_zh(text: str) -> str:
     
     # 首先尝试Google Translate
     try:
-        translate_client = translate.Client()
+        translate_client = get_translate_client()
         result = translate_client.translate(
             values=[text],
             target_language='zh-CN',
@@ -39,7 +73,7 @@ def translate_en_to_zh(text: str) -> str:
                 'langpair': 'en|zh-CN'
             }
             
-            response = requests.get(url, params=params, timeout=5)
+            response = _requests_session.get(url, params=params, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('responseStatus') == 200:
@@ -88,7 +122,7 @@ async def translate_en_to_zh_async(text: str, max_retries: int = 2) -> str:
             print(f"[TranslateAsync] 🔄 Google Translate attempt {attempt + 1}/{max_retries + 1}: '{text[:50]}{'...' if len(text) > 50 else ''}'")
             
             def _sync_google_translate(text: str) -> str:
-                translate_client = translate.Client()
+                translate_client = get_translate_client()
                 result = translate_client.translate(
                     values=[text],
                     target_language='zh-CN',
@@ -98,11 +132,9 @@ async def translate_en_to_zh_async(text: str, max_retries: int = 2) -> str:
                     return result[0]['translatedText']
                 raise Exception("No translation result from Google API")
             
-            # 使用超时控制
-            translation = await asyncio.wait_for(
-                asyncio.to_thread(_sync_google_translate, text), 
-                timeout=5.0  # 5秒超时
-            )
+            # 使用超时控制（5秒），asyncio.timeout不为被等待的协程额外包装Task
+            async with asyncio.timeout(5.0):
+                translation = await asyncio.to_thread(_sync_google_translate, text)
             
             # 成功获取翻译
             _translation_stats['google_success'] += 1
@@ -140,22 +172,21 @@ async def translate_en_to_zh_async(text: str, max_retries: int = 2) -> str:
                 'langpair': 'en|zh-CN'
             }
             
-            timeout = aiohttp.ClientTimeout(total=4)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get('responseStatus') == 200:
-                            translation = data['responseData']['translatedText']
+            session = _get_http_session()
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data.get('responseStatus') == 200:
+                        translation = data['responseData']['translatedText']
                             
-                            _translation_stats['mymemory_success'] += 1
-                            _update_cache(text, translation)
-                            print(f"[TranslateAsync] ✅ MyMemory success: '{text}' -> '{translation}'")
-                            return translation
-                        else:
-                            raise Exception(f"MyMemory API error: {data.get('responseDetails', 'Unknown error')}")
+                        _translation_stats['mymemory_success'] += 1
+                        _update_cache(text, translation)
+                        print(f"[TranslateAsync] ✅ MyMemory success: '{text}' -> '{translation}'")
+                        return translation
                     else:
-                        raise Exception(f"MyMemory HTTP {response.status}")
+                        raise Exception(f"MyMemory API error: {data.get('responseDetails', 'Unknown error')}")
+                else:
+                    raise Exception(f"MyMemory HTTP {response.status}")
                         
         except Exception as fallback_error:
             _translation_stats['retries'] += 1
@@ -221,7 +252,7 @@ async def translate_zh_to_en_async(text: str, max_retries: int = 2) -> str:
             print(f"[TranslateAsync] 🔄 Google Translate attempt {attempt + 1}/{max_retries + 1} (ZH->EN): '{text[:50]}{'...' if len(text) > 50 else ''}'")
             
             def _sync_google_translate_zh_to_en(text: str) -> str:
-                translate_client = translate.Client()
+                translate_client = get_translate_client()
                 result = translate_client.translate(
                     values=[text],
                     target_language='en',
@@ -258,22 +289,21 @@ async def translate_zh_to_en_async(text: str, max_retries: int = 2) -> str:
             'langpair': 'zh-CN|en'
         }
         
-        timeout = aiohttp.ClientTimeout(total=4)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get('responseStatus') == 200:
-                        translation = data['responseData']['translatedText']
+        session = _get_http_session()
+        async with session.get(url, params=params) as response:
+            if response.status == 200:
+                data = await response.json()
+                if data.get('responseStatus') == 200:
+                    translation = data['responseData']['translatedText']
                         
-                        _translation_stats['mymemory_success'] += 1
-                        _translation_cache[cache_key] = translation
-                        print(f"[TranslateAsync] ✅ MyMemory success (ZH->EN): '{text}' -> '{translation}'")
-                        return translation
-                    else:
-                        raise Exception(f"MyMemory API error: {data.get('responseDetails', 'Unknown error')}")
+                    _translation_stats['mymemory_success'] += 1
+                    _translation_cache[cache_key] = translation
+                    print(f"[TranslateAsync] ✅ MyMemory success (ZH->EN): '{text}' -> '{translation}'")
+                    return translation
                 else:
-                    raise Exception(f"MyMemory HTTP {response.status}")
+                    raise Exception(f"MyMemory API error: {data.get('responseDetails', 'Unknown error')}")
+            else:
+                raise Exception(f"MyMemory HTTP {response.status}")
                     
     except Exception as e:
         print(f"[TranslateAsync] ❌ MyMemory failed (ZH->EN): {e}")